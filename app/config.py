@@ -3,9 +3,11 @@ Configuration settings for the Instagram Downloader API.
 Provides centralized configuration management with validation and environment variable support.
 """
 
+import copy
+import functools
 import os
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -41,6 +43,16 @@ class VideoConfig:
     # Video quality settings
     VIDEO_QUALITY: str = os.getenv("VIDEO_QUALITY", "best")
     VIDEO_FORMAT: str = os.getenv("VIDEO_FORMAT", "mp4")
+    
+    # H.264 encoder for generated videos: "auto" picks the first working hardware
+    # encoder (h264_nvenc, h264_qsv, h264_videotoolbox) and falls back to libx264
+    H264_ENCODER: str = os.getenv("H264_ENCODER", "auto")
+    
+    # Write large video downloads through io_uring on Linux (needs the optional liburing package)
+    USE_IO_URING: bool = os.getenv("USE_IO_URING", "false").lower() == "true"
+    
+    # Open large video downloads with O_DIRECT to bypass the page cache (needs filesystem support, not tmpfs)
+    USE_ODIRECT: bool = os.getenv("USE_ODIRECT", "false").lower() == "true"
 
 
 class LoggingConfig:
@@ -89,10 +101,19 @@ class AppConfig:
     # Logging configuration
     LOGGING = LoggingConfig()
     
+    # The getters below only read class attributes, which are fixed at import, so each
+    # result is built once; callers get their own copy so the memoized one can't be mutated
+    
+    @classmethod
+    @functools.cache
+    def _cors_origins(cls) -> Tuple[str, ...]:
+        """Parse CORS_ORIGINS once; get_cors_origins hands out copies."""
+        return tuple(origin.strip() for origin in cls.CORS_ORIGINS.split(","))
+    
     @classmethod
     def get_cors_origins(cls) -> list:
         """Get CORS origins as a list."""
-        return [origin.strip() for origin in cls.CORS_ORIGINS.split(",")]
+        return list(cls._cors_origins())
     
     @classmethod
     def validate_config(cls) -> list:
@@ -146,6 +167,12 @@ class AppConfig:
         Returns:
             Dict containing configuration summary
         """
+        return copy.deepcopy(cls._config_summary())
+    
+    @classmethod
+    @functools.cache
+    def _config_summary(cls) -> Dict[str, Any]:
+        """Build the configuration summary once; get_config_summary hands out copies."""
         return {
             "app": {
                 "name": cls.APP_NAME,
@@ -165,7 +192,8 @@ class AppConfig:
             "video": {
                 "max_files": cls.VIDEO.MAX_VIDEO_FILES,
                 "quality": cls.VIDEO.VIDEO_QUALITY,
-                "format": cls.VIDEO.VIDEO_FORMAT
+                "format": cls.VIDEO.VIDEO_FORMAT,
+                "h264_encoder": cls.VIDEO.H264_ENCODER
             },
             "logging": {
                 "level": cls.LOGGING.LOG_LEVEL,
@@ -173,3 +201,12 @@ class AppConfig:
                 "file": cls.LOGGING.ENABLE_FILE_LOGGING
             }
         }
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """
+        Drop the memoized results so they are recomputed on next call
+        (e.g. after a test patches configuration attributes).
+        """
+        cls._cors_origins.cache_clear()
+        cls._config_summary.cache_clear()
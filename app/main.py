@@ -5,6 +5,7 @@ Provides centralized application initialization, configuration, and lifecycle ma
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import logging
 import os
@@ -16,6 +17,7 @@ from typing import Optional
 from contextlib import asynccontextmanager
 
 from app.services import InstagramService, TikTokService
+from app.services.base_service import BaseService
 from app.services.ffmpeg_utils import verify_ffmpeg_installation, cleanup_audio_files
 from app.config import AppConfig
 from app.utils.logger import get_logger, get_request_logger, get_service_logger
@@ -160,14 +162,19 @@ class ApplicationManager:
             # Cleanup services
             if self.instagram_service:
                 self.log_to_file("🔧 Shutting down Instagram service...", log_path)
-                # Add any service-specific cleanup here
                 self.instagram_service = None
             
+            # Request handlers build their own services; close the HTTP client they all share
+            await InstagramService.close()
+            
             if self.tiktok_service:
                 self.log_to_file("🔧 Shutting down TikTok service...", log_path)
                 # Add any service-specific cleanup here
                 self.tiktok_service = None
             
+            # Let in-flight sidecar writes and media cleanup finish
+            await BaseService.wait_for_background_tasks(timeout=3.0)
+            
             # Cancel any remaining asyncio tasks
             current_task = asyncio.current_task()
             for task in asyncio.all_tasks():
@@ -329,7 +336,9 @@ def create_app() -> FastAPI:
         description="API for downloading Instagram and TikTok videos with audio extraction",
         version=AppConfig.APP_VERSION,
         debug=AppConfig.DEBUG,
-        lifespan=lifespan
+        lifespan=lifespan,
+        # Serialize endpoint responses with orjson instead of the stdlib json module
+        default_response_class=ORJSONResponse
     )
 
     # Add logging middleware
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.exceptions import RequestValidationError
 from app.schemas import DownloadRequest, DownloadResponse, ErrorResponse
+from app.schemas.requests import INSTAGRAM_POST_REGEX, TIKTOK_POST_REGEX
 from app.services import InstagramService, TikTokService
 from app.services.ffmpeg_utils import verify_ffmpeg_installation, get_ffmpeg_performance_info
 from app.utils.url_validator import validate_url
 from typing import Union
 import logging
+import orjson
 
 router = APIRouter(prefix="/api", tags=["download"])
 logger = logging.getLogger(__name__)
@@ -23,9 +26,73 @@ def get_tiktok_service() -> TikTokService:
     return TikTokService()
 
 
-@router.post("/download/", response_model=Union[DownloadResponse, ErrorResponse])
+async def parse_download_request(request: Request) -> str:
+    """
+    Parse the download request body without building a Pydantic model.
+    
+    The body is a single {"url": "..."} object, so it is decoded with orjson and
+    checked by hand; errors use the same 422 shape as FastAPI's body validation.
+    
+    Args:
+        request: Incoming HTTP request
+        
+    Returns:
+        The submitted URL
+        
+    Raises:
+        RequestValidationError: If the body is not JSON or has no string "url"
+    """
+    body = await request.body()
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise RequestValidationError([{
+            "type": "json_invalid",
+            "loc": ("body", e.pos),
+            "msg": "JSON decode error",
+            "input": {},
+            "ctx": {"error": e.msg},
+        }])
+    
+    if not isinstance(data, dict):
+        raise RequestValidationError([{
+            "type": "model_attributes_type",
+            "loc": ("body",),
+            "msg": "Input should be a valid dictionary or object to extract fields from",
+            "input": data,
+        }])
+    
+    if "url" not in data:
+        raise RequestValidationError([{
+            "type": "missing",
+            "loc": ("body", "url"),
+            "msg": "Field required",
+            "input": data,
+        }])
+    url = data["url"]
+    if not isinstance(url, str):
+        raise RequestValidationError([{
+            "type": "string_type",
+            "loc": ("body", "url"),
+            "msg": "Input should be a valid string",
+            "input": url,
+        }])
+    return url
+
+
+@router.post(
+    "/download/",
+    response_model=Union[DownloadResponse, ErrorResponse],
+    # The body is parsed by hand, so its schema is declared here for the docs
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": DownloadRequest.model_json_schema()}},
+        }
+    },
+)
 async def download_video(
-    request: DownloadRequest,
+    url: str = Depends(parse_download_request),
     ig_service: InstagramService = Depends(get_instagram_service),
     tt_service: TikTokService = Depends(get_tiktok_service),
 ) -> Union[DownloadResponse, ErrorResponse]:
@@ -34,7 +101,7 @@ async def download_video(
     return normalized metadata with a public video URL.
     
     Args:
-        request: Download request containing the video URL
+        url: Video URL from the request body
         ig_service: Instagram service dependency
         tt_service: TikTok service dependency
         
@@ -45,11 +112,10 @@ async def download_video(
         HTTPException: For various error conditions with appropriate status codes
     """
     try:
-        logger.info("Processing download request for URL: %s", request.url)
+        logger.info("Processing download request for URL: %s", url)
         
         # Manual URL validation to return 200 with error JSON instead of 422
-        raw = str(request.url)
-        lowered = raw.lower()
+        raw = url.strip()
         
         # First check if it's a valid URL format
         if not (raw.startswith('http://') or raw.startswith('https://')):
@@ -59,20 +125,24 @@ async def download_video(
                 details="URL must start with http:// or https://"
             )
         
-        # Check if URL is supported platform
-        from app.schemas.requests import INSTAGRAM_POST_REGEX, TIKTOK_POST_REGEX
-        if not (INSTAGRAM_POST_REGEX.match(raw) or TIKTOK_POST_REGEX.match(raw)):
+        # Check if URL is supported platform; the validator also identifies which one
+        is_valid, platform, error = validate_url(raw)
+        if is_valid and not (INSTAGRAM_POST_REGEX.match(raw) or TIKTOK_POST_REGEX.match(raw)):
+            # The validator matches by prefix; the schema patterns are anchored at the end,
+            # so trailing junk after the post ID is still rejected
+            is_valid, error = False, "URL must be a valid Instagram post/reel or TikTok video link"
+        if not is_valid:
             return ErrorResponse(
                 error="Unsupported URL format",
                 error_code="INVALID_URL_FORMAT",
-                details="URL must be a valid Instagram post/reel or TikTok video link"
+                details=error
             )
         
-        # Determine platform and call appropriate service
-        if "instagram.com" in lowered:
+        # Call the service for the detected platform
+        if platform == 'instagram':
             logger.info("Processing Instagram URL with Instagram service")
             _, metadata = await ig_service.download_post(raw)
-        elif "tiktok.com" in lowered or "vm.tiktok.com" in lowered or "vt.tiktok.com" in lowered:
+        elif platform == 'tiktok':
             logger.info("Processing TikTok URL with TikTok service")
             _, metadata = await tt_service.download_post(raw)
         else:
@@ -94,7 +164,7 @@ async def download_video(
             "audio_url": metadata.get("audio_url"),
         }
         
-        logger.info("Download completed successfully for URL: %s", request.url)
+        logger.info("Download completed successfully for URL: %s", url)
         return DownloadResponse(**filtered)
         
     except ValueError as e:
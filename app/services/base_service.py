@@ -3,20 +3,50 @@ Base service class for common functionality between Instagram and TikTok service
 Provides shared methods for file management, audio extraction, and metadata handling.
 """
 
+import asyncio
+import aiofiles
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Tuple, Any, Optional
+from typing import Dict, Tuple, Any, Optional, Set, Awaitable
 from datetime import datetime
 from .ffmpeg_utils import extract_audio_from_video, get_audio_path, get_audio_url, cleanup_audio_files
 from app.config import AppConfig
 
 
+# Shared by all service instances; unlinks of different files proceed in parallel in the kernel
+_UNLINK_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="media-cleanup")
+
+
+def _try_unlink(path: Path) -> Optional[OSError]:
+    """
+    Remove a file if present.
+    
+    Args:
+        path: File to remove
+        
+    Returns:
+        The error raised by unlink, or None on success (including a missing file)
+    """
+    try:
+        path.unlink(missing_ok=True)
+        return None
+    except OSError as e:
+        return e
+
+
 class BaseService:
     """
     Base service class providing common functionality for social media download services.
     """
     
+    # Stems of the .mp4 files in each media directory, shared by all instances in the process
+    _known_ids_by_dir: Dict[Path, Set[str]] = {}
+    
+    # Fire-and-forget work (sidecar writes, cleanup); referenced here so pending tasks aren't GC'd
+    _background_tasks: Set["asyncio.Task[Any]"] = set()
+    
     def __init__(self, media_dir: str = "app/media", max_files: int = 10):
         """
         Initialize the base service with common configuration.
@@ -32,44 +62,91 @@ class BaseService:
         
         self.logger.info(f"{self.__class__.__name__} initialized | media_dir={self.media_dir}")
     
+    def _spawn_background(self, coro: Awaitable[Any]) -> None:
+        """
+        Run a coroutine in the background without delaying the response.
+        Failures are logged since nobody awaits the task.
+        
+        Args:
+            coro: Coroutine to schedule
+        """
+        task = asyncio.ensure_future(coro)
+        BaseService._background_tasks.add(task)
+        task.add_done_callback(self._on_background_done)
+    
+    def _on_background_done(self, task: "asyncio.Task[Any]") -> None:
+        BaseService._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.warning(f"Background task failed: {str(task.exception())}")
+    
+    @classmethod
+    async def wait_for_background_tasks(cls, timeout: float) -> None:
+        """
+        Wait for pending background work, e.g. during shutdown.
+        
+        Args:
+            timeout: Maximum number of seconds to wait
+        """
+        if cls._background_tasks:
+            await asyncio.wait(set(cls._background_tasks), timeout=timeout)
+    
+    def _known_video_ids(self) -> Set[str]:
+        """
+        Return the ids of videos already in the media directory.
+        Built with one directory scan per process, then kept in sync by
+        download_post and _cleanup_old_files.
+        
+        Returns:
+            Mutable set of video file stems
+        """
+        known_ids = BaseService._known_ids_by_dir.get(self.media_dir)
+        if known_ids is None:
+            with os.scandir(self.media_dir) as it:
+                scanned = {entry.name[:-4] for entry in it if entry.name.endswith(".mp4")}
+            known_ids = BaseService._known_ids_by_dir.setdefault(self.media_dir, scanned)
+        return known_ids
+    
     def _cleanup_old_files(self):
         """
         Clean up old video files, keeping only the most recent max_files videos.
         Files are sorted by modification time (newest first).
         """
         try:
-            # Get all video files in media directory
-            video_files = list(self.media_dir.glob("*.mp4"))
+            # Single directory pass; the mtime comes from the DirEntry instead of a glob + stat per file
+            with os.scandir(self.media_dir) as it:
+                video_files = [
+                    (entry.stat().st_mtime, entry.name)
+                    for entry in it
+                    if entry.name.endswith(".mp4") and entry.is_file()
+                ]
             
             if len(video_files) <= self.max_files:
                 return  # No cleanup needed
             
             # Sort by modification time (newest first)
-            video_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+            video_files.sort(reverse=True)
             
             # Files to delete (oldest ones)
-            files_to_delete = video_files[self.max_files:]
-            
-            deleted_count = 0
-            for file_path in files_to_delete:
-                try:
-                    # Delete associated files (.json, .txt)
-                    base_name = file_path.stem
-                    json_file = self.media_dir / f"{base_name}.json"
-                    txt_file = self.media_dir / f"{base_name}.txt"
-                    
-                    # Delete main video file
-                    file_path.unlink()
-                    deleted_count += 1
-                    
-                    # Delete associated metadata files
-                    if json_file.exists():
-                        json_file.unlink()
-                    if txt_file.exists():
-                        txt_file.unlink()
-                        
-                except Exception as e:
-                    self.logger.warning(f"Failed to delete file {file_path}: {str(e)}")
+            files_to_delete = [self.media_dir / name for _, name in video_files[self.max_files:]]
+            
+            # Unlink videos in parallel, then the sidecars (.json, .txt) of the ones that were removed
+            results = list(_UNLINK_POOL.map(_try_unlink, files_to_delete))
+            
+            known_ids = BaseService._known_ids_by_dir.get(self.media_dir)
+            deleted = []
+            for file_path, error in zip(files_to_delete, results):
+                if error is not None:
+                    self.logger.warning(f"Failed to delete file {file_path}: {str(error)}")
+                    continue
+                deleted.append(file_path)
+                if known_ids is not None:
+                    known_ids.discard(file_path.stem)
+            deleted_count = len(deleted)
+            
+            sidecars = [path.with_suffix(suffix) for path in deleted for suffix in (".json", ".txt")]
+            for sidecar, error in zip(sidecars, _UNLINK_POOL.map(_try_unlink, sidecars)):
+                if error is not None:
+                    self.logger.warning(f"Failed to delete file {sidecar}: {str(error)}")
             
             if deleted_count > 0:
                 self.logger.info(f"File cleanup completed, deleted {deleted_count} files")
@@ -109,6 +186,30 @@ class BaseService:
             self.logger.error(f"❌ Audio extraction error: {str(e)}")
             return False, None
     
+    async def _extract_audio_async(self, video_path: Path) -> Tuple[bool, Optional[str]]:
+        """
+        Extract audio in a worker thread so the event loop keeps serving requests.
+        
+        Args:
+            video_path: Path to the video file
+            
+        Returns:
+            Tuple of (success, audio_url)
+        """
+        return await asyncio.to_thread(self._extract_audio_from_video, video_path)
+    
+    @staticmethod
+    async def _write_file(path: Path, data: bytes) -> None:
+        """
+        Write a whole file in one call without blocking the event loop.
+        
+        Args:
+            path: Destination file path
+            data: File contents
+        """
+        async with aiofiles.open(path, "wb") as fp:
+            await fp.write(data)
+    
     def _build_metadata_with_audio(self, author: str, description: str, target_mp4: Path, 
                                   created_at: Optional[datetime] = None) -> Dict[str, Any]:
         """
@@ -3,11 +3,14 @@ FFmpeg utilities for audio extraction functionality.
 Provides functions to verify FFmpeg installation and extract audio from videos.
 """
 
+import asyncio
+import functools
 import subprocess
 import logging
 import os
 import time
 from typing import Optional, Tuple, Dict, Any
+import re
 import ffmpeg
 from app.config import AppConfig
 
@@ -38,6 +41,137 @@ def verify_ffmpeg_installation() -> bool:
         return False
 
 
+# Hardware H.264 encoders in order of preference
+HW_H264_ENCODERS = ('h264_nvenc', 'h264_qsv', 'h264_videotoolbox')
+
+
+def _probe_encoder(encoder: str) -> bool:
+    """
+    Check that an encoder actually works by encoding a few tiny yuv420p frames.
+    Encoders can be compiled into FFmpeg without the matching hardware being present.
+    
+    Args:
+        encoder (str): FFmpeg encoder name
+        
+    Returns:
+        bool: True if the test encode succeeded
+    """
+    try:
+        subprocess.run(
+            ['ffmpeg', '-hide_banner', '-loglevel', 'error',
+             '-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.1',
+             '-pix_fmt', 'yuv420p', '-c:v', encoder, '-f', 'null', '-'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+            timeout=10
+        )
+        return True
+    except (subprocess.SubprocessError, FileNotFoundError, subprocess.TimeoutExpired):
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def detect_h264_encoder() -> str:
+    """
+    Pick the H.264 encoder used for generated videos.
+    Honours AppConfig.VIDEO.H264_ENCODER; in "auto" mode prefers a working
+    hardware encoder and falls back to libx264. The result is cached per process.
+    
+    Returns:
+        str: FFmpeg encoder name
+    """
+    configured = AppConfig.VIDEO.H264_ENCODER.strip().lower()
+    if configured and configured != 'auto':
+        logger.info(f"Using configured H.264 encoder: {configured}")
+        return configured
+    
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True,
+            timeout=10
+        )
+        available = set(re.findall(r'^\s*V\S*\s+(\S+)', result.stdout, re.MULTILINE))
+    except (subprocess.SubprocessError, FileNotFoundError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"Cannot list FFmpeg encoders, using libx264: {str(e)}")
+        return 'libx264'
+    
+    for encoder in HW_H264_ENCODERS:
+        if encoder in available and _probe_encoder(encoder):
+            logger.info(f"Using hardware H.264 encoder: {encoder}")
+            return encoder
+    
+    logger.info("No hardware H.264 encoder available, using libx264")
+    return 'libx264'
+
+
+def get_h264_encoder_args(encoder: str, crf: int = 23, still_image: bool = False) -> Dict[str, Any]:
+    """
+    Build ffmpeg output arguments for an H.264 encoder at a comparable quality level.
+    
+    Args:
+        encoder (str): FFmpeg encoder name (see detect_h264_encoder)
+        crf (int): libx264 CRF value; mapped to the encoder's own quality scale
+        still_image (bool): Encode slideshow-like content made of still frames: every
+            frame is a keyframe so the output can be seeked to any frame, and libx264
+            is tuned for still images
+        
+    Returns:
+        Dict[str, Any]: Keyword arguments for ffmpeg-python's output()
+    """
+    if encoder == 'h264_nvenc':
+        args = {'vcodec': 'h264_nvenc', 'preset': 'p5', 'rc': 'vbr', 'cq': crf + 2, 'b:v': '0'}
+    elif encoder == 'h264_qsv':
+        args = {'vcodec': 'h264_qsv', 'global_quality': crf + 2, 'preset': 'medium'}
+    elif encoder == 'h264_videotoolbox':
+        args = {'vcodec': 'h264_videotoolbox', 'q:v': 55}
+    else:
+        args = {'vcodec': 'libx264', 'crf': crf, 'preset': 'medium'}
+        if still_image:
+            args['tune'] = 'stillimage'
+    if still_image:
+        args['g'] = 1
+    return args
+
+
+async def run_ffmpeg_async(stream) -> Tuple[bytes, bytes]:
+    """
+    Run an ffmpeg-python stream in a subprocess without blocking the event loop.
+    
+    Args:
+        stream: ffmpeg-python output stream to execute
+        
+    Returns:
+        Tuple[bytes, bytes]: (stdout, stderr) captured from the ffmpeg process
+        
+    Raises:
+        ffmpeg.Error: If ffmpeg exits with a non-zero status
+    """
+    args = ffmpeg.compile(stream)
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        # A cancelled request must not leave an orphaned ffmpeg encoding in the background
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+        raise
+    if process.returncode != 0:
+        raise ffmpeg.Error('ffmpeg', stdout, stderr)
+    return stdout, stderr
+
+
 def extract_audio_from_video(video_path: str, audio_path: str) -> Tuple[bool, Optional[str]]:
     """
     Extract audio track from a video file using FFmpeg with comprehensive error handling.
@@ -0,0 +1,145 @@
+"""
+Direct Instagram GraphQL lookup of post metadata.
+Issues the same shortcode query instaloader uses for Post.from_shortcode, but over the
+shared async httpx client, so the event loop is never blocked on a requests session.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Iterator
+from unicodedata import normalize
+
+import httpx
+import orjson
+
+
+GRAPHQL_URL = "https://www.instagram.com/graphql/query"
+
+# doc_id of the xdt_shortcode_media query (kept in sync with instaloader's Post._obtain_metadata)
+SHORTCODE_MEDIA_DOC_ID = "8845758582119845"
+
+# The web API prefixes typenames with XDT; the rest of the service expects instaloader's names
+XDT_TYPENAMES = {
+    "XDTGraphImage": "GraphImage",
+    "XDTGraphVideo": "GraphVideo",
+    "XDTGraphSidecar": "GraphSidecar",
+}
+
+
+@dataclass(frozen=True)
+class LiteSidecarNode:
+    """
+    Single media item of a carousel post.
+    """
+    is_video: bool
+    display_url: str
+    video_url: Optional[str] = None
+
+
+@dataclass
+class LitePost:
+    """
+    Minimal stand-in for instaloader.Post exposing only the fields the service reads.
+    """
+    shortcode: str
+    mediaid: int
+    typename: str
+    is_video: bool
+    url: str
+    video_url: Optional[str]
+    caption: Optional[str]
+    date: datetime
+    owner_username: str
+    sidecar_nodes: List[LiteSidecarNode] = field(default_factory=list)
+
+    def get_sidecar_nodes(self) -> Iterator[LiteSidecarNode]:
+        """Iterate over carousel items, mirroring instaloader.Post.get_sidecar_nodes."""
+        return iter(self.sidecar_nodes)
+
+
+def parse_shortcode_media(media: Dict[str, Any]) -> LitePost:
+    """
+    Build a LitePost from an xdt_shortcode_media GraphQL node.
+
+    Args:
+        media: The xdt_shortcode_media object of the GraphQL response
+
+    Returns:
+        Parsed post
+
+    Raises:
+        KeyError: If required fields are missing or the typename is unknown
+    """
+    typename = XDT_TYPENAMES[media["__typename"]]
+
+    caption = None
+    caption_edges = media.get("edge_media_to_caption", {}).get("edges") or []
+    if caption_edges:
+        caption = normalize("NFC", caption_edges[0]["node"]["text"])
+
+    sidecar_nodes = []
+    if typename == "GraphSidecar":
+        for edge in media["edge_sidecar_to_children"]["edges"]:
+            node = edge["node"]
+            sidecar_nodes.append(LiteSidecarNode(
+                is_video=node["is_video"],
+                display_url=node["display_url"],
+                video_url=node.get("video_url") if node["is_video"] else None,
+            ))
+
+    return LitePost(
+        shortcode=media["shortcode"],
+        mediaid=int(media["id"]),
+        typename=typename,
+        is_video=media["is_video"],
+        url=media["display_url"],
+        video_url=media.get("video_url") if media["is_video"] else None,
+        caption=caption,
+        # Same naive-UTC semantics as instaloader's Post.date
+        date=datetime.fromtimestamp(media["taken_at_timestamp"], tz=timezone.utc).replace(tzinfo=None),
+        owner_username=media["owner"]["username"].lower(),
+        sidecar_nodes=sidecar_nodes,
+    )
+
+
+async def fetch_lite_post(client: httpx.AsyncClient, shortcode: str, headers: Dict[str, str]) -> LitePost:
+    """
+    Fetch post metadata by shortcode from the Instagram web GraphQL endpoint.
+
+    Args:
+        client: Shared async HTTP client
+        shortcode: Post shortcode
+        headers: Request headers, including the session cookies when authenticated
+
+    Returns:
+        Parsed post
+
+    Raises:
+        httpx.HTTPStatusError: If Instagram returns an error status
+        ValueError: If the response does not contain the post
+    """
+    resp = await client.post(
+        GRAPHQL_URL,
+        data={
+            "variables": orjson.dumps({"shortcode": shortcode}).decode(),
+            "doc_id": SHORTCODE_MEDIA_DOC_ID,
+            "server_timestamps": "true",
+        },
+        headers=headers,
+        follow_redirects=False,
+    )
+    resp.raise_for_status()
+
+    try:
+        media = orjson.loads(resp.content)["data"]["xdt_shortcode_media"]
+    except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Unexpected GraphQL response: {str(e)}") from e
+    if media is None:
+        raise ValueError("GraphQL response did not contain the post")
+    if media.get("shortcode") != shortcode:
+        raise ValueError("GraphQL response is for a different post")
+
+    try:
+        return parse_shortcode_media(media)
+    except KeyError as e:
+        raise ValueError(f"Missing field in GraphQL response: {str(e)}") from e
@@ -4,25 +4,66 @@ from instaloader.exceptions import (
     LoginRequiredException,
     QueryReturnedForbiddenException,
 )
+import asyncio
+import importlib.util
 import logging
 import os
+import stat
 from datetime import datetime
-from typing import Dict, Tuple, Any, Optional, List
+from typing import Dict, Tuple, Any, Optional, List, Callable, Awaitable, Union
 from pathlib import Path
-import json
+import orjson
+import shutil
 import httpx
+import aiofiles
+import aiofiles.os
 import uuid
 import ffmpeg
+from cachetools import TTLCache
+from PIL import Image
 from .base_service import BaseService
+from .instagram_graphql import LitePost, fetch_lite_post
+from .ffmpeg_utils import run_ffmpeg_async, detect_h264_encoder, get_h264_encoder_args
 from app.config import AppConfig
 from app.utils.logger import get_service_logger
+from app.utils.uring_writer import UringWriter, URING_AVAILABLE
+from app.utils.direct_writer import DirectWriter, DIRECT_IO_AVAILABLE
+from app.utils.fast_stat import fast_exists
 from app.utils.exceptions import ServiceError, VideoDownloadError
 
+# httpx speaks HTTP/2 only when the optional h2 package (httpx[http2]) is installed
+HTTP2_AVAILABLE: bool = importlib.util.find_spec("h2") is not None
+
 class InstagramService(BaseService):
     """
     Service for downloading Instagram posts and extracting metadata.
     """
     
+    # Maximum number of carousel images downloaded in parallel
+    CAROUSEL_DOWNLOAD_CONCURRENCY = 8
+    
+    # Chunk size for streamed media downloads
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+    
+    # Downloaded chunks are buffered up to this size before each disk write
+    WRITE_BUFFER_SIZE = 8 * 1024 * 1024
+    
+    # Side length of the square (Instagram format) slideshow frames
+    SLIDE_SIZE = 1080
+    
+    # Post metadata cache limits (entries, seconds)
+    POST_CACHE_SIZE = 256
+    POST_CACHE_TTL = 300
+    
+    # Cached 1-second silent track copied for posts without audio; dot-prefixed to stay out of post listings
+    SILENCE_TEMPLATE_NAME = ".silence_1s.mp3"
+    
+    # Post metadata by shortcode, shared by all instances so repeat requests do not refetch the same post
+    _post_cache: TTLCache = TTLCache(maxsize=POST_CACHE_SIZE, ttl=POST_CACHE_TTL)
+    
+    # HTTP client for media downloads, shared by all instances so connections are pooled across requests
+    _http: Optional[httpx.AsyncClient] = None
+    
     def __init__(self, media_dir: str = "app/media"):
         """
         Initialize the Instagram service with instaloader configuration.
@@ -45,6 +86,9 @@ class InstagramService(BaseService):
             compress_json=False
         )
         
+        # H.264 encoder for generated videos (hardware encoder when available)
+        self._h264_encoder = detect_h264_encoder()
+        
         # Session-based authentication
         self._setup_session_auth()
         
@@ -59,52 +103,145 @@ class InstagramService(BaseService):
         project_root = Path(__file__).parent.parent.parent
         session_file = project_root / ".instaloader-session"
         
-        self.logger.info("🔐 Starting Instagram authentication process...")
-        self.logger.info(f"📁 Session file path: {session_file}")
+        self.logger.debug("Starting Instagram authentication", session_file=str(session_file))
         
-        # Check if session file exists
-        if not session_file.exists():
-            self.logger.warning(f"⚠️  Session file not found: {session_file}")
-            self.logger.info("❌ Authentication failed: No session file available")
-            self.logger.info("💡 Working in unauthenticated mode - some content may be inaccessible")
+        # A single stat covers existence, file type and size
+        try:
+            st = os.stat(session_file)
+        except FileNotFoundError:
+            self.logger.warning(
+                "⚠️  Session file not found - working in unauthenticated mode, some content may be inaccessible",
+                session_file=str(session_file)
+            )
+            return
+        except Exception as e:
+            self.logger.error(f"❌ Authentication failed: Cannot read session file: {str(e)}")
             return
         
-        # Check if session file is readable
-        if not session_file.is_file():
+        if not stat.S_ISREG(st.st_mode):
             self.logger.error("❌ Authentication failed: Session file is not a regular file")
             return
         
-        # Check file size
-        try:
-            file_size = session_file.stat().st_size
-            self.logger.info(f"📊 Session file size: {file_size} bytes")
-            if file_size == 0:
-                self.logger.warning("⚠️  Session file is empty")
-                self.logger.info("❌ Authentication failed: Empty session file")
-                return
-        except Exception as e:
-            self.logger.error(f"❌ Authentication failed: Cannot read session file: {str(e)}")
+        file_size = st.st_size
+        if file_size == 0:
+            self.logger.warning("⚠️  Authentication failed: Session file is empty")
             return
         
         # Try to load session
         try:
-            self.logger.info("🔄 Attempting to load Instagram session...")
-            
             # Get username from environment or use default
             username = os.getenv("INSTAGRAM_USERNAME", "default_user")
-            self.logger.info(f"👤 Loading session for user: {username}")
             
             with open(session_file, "rb") as sf:
                 self.loader.context.load_session_from_file(username, sessionfile=sf)
             
-            self.logger.info("✅ Instagram authentication successful!")
-            self.logger.info(f"🎉 Session loaded successfully for user: {username}")
-            self.logger.info("🚀 Ready to download Instagram content")
+            self.logger.info("✅ Instagram session loaded", username=username, session_size=file_size)
             
         except Exception as e:
-            self.logger.error(f"❌ Authentication failed: Cannot load session: {str(e)}")
-            self.logger.warning("⚠️  Session file may be corrupted or invalid")
-            self.logger.info("💡 Working in unauthenticated mode - some content may be inaccessible")
+            self.logger.error(
+                f"❌ Authentication failed: Cannot load session (file may be corrupted or invalid): {str(e)}"
+            )
+    
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Return the shared HTTP client, creating it on first use.
+        
+        Returns:
+            Shared httpx.AsyncClient instance
+        """
+        client = InstagramService._http
+        if client is None or client.is_closed:
+            # HTTP/2 multiplexes concurrent CDN fetches (carousel images) over one connection
+            client = httpx.AsyncClient(timeout=60, follow_redirects=True, http2=HTTP2_AVAILABLE)
+            InstagramService._http = client
+        return client
+    
+    async def _stream_to_file(self, url: str, path: Path, large_file: bool = False) -> None:
+        """
+        Stream a remote file to disk without blocking the event loop on writes.
+        
+        Args:
+            url: URL of the file to download
+            path: Destination file path
+            large_file: Use the O_DIRECT / io_uring writers when enabled (worth it for videos)
+            
+        Raises:
+            httpx.HTTPStatusError: If the server returns an error status
+        """
+        client = self._get_http_client()
+        async with client.stream("GET", url) as resp:
+            resp.raise_for_status()
+            
+            writer = self._open_large_file_writer(path) if large_file else None
+            if writer is not None:
+                try:
+                    await self._copy_stream(resp, writer.write)
+                    await writer.flush()
+                finally:
+                    writer.close()
+                return
+            
+            async with aiofiles.open(path, "wb") as fp:
+                await self._copy_stream(resp, fp.write)
+    
+    def _open_large_file_writer(self, path: Path) -> Optional[Union[DirectWriter, UringWriter]]:
+        """
+        Open the preferred writer for a large download.
+        
+        Args:
+            path: Destination file path
+            
+        Returns:
+            Opened DirectWriter or UringWriter, or None to use aiofiles
+        """
+        if DIRECT_IO_AVAILABLE and AppConfig.VIDEO.USE_ODIRECT:
+            # Staging buffer matches the coalesced write size
+            writer = DirectWriter(path, buffer_size=self.WRITE_BUFFER_SIZE)
+            try:
+                writer.open()
+                return writer
+            except OSError as e:
+                writer.close()
+                self.logger.warning(f"O_DIRECT unavailable, falling back: {str(e)}")
+        
+        if URING_AVAILABLE and AppConfig.VIDEO.USE_IO_URING:
+            # Writes are already coalesced, so only a couple of buffers are kept in flight
+            writer = UringWriter(path, batch_size=2)
+            try:
+                writer.open()
+                return writer
+            except OSError as e:
+                writer.close()
+                self.logger.warning(f"io_uring unavailable, falling back to aiofiles: {str(e)}")
+        
+        return None
+    
+    async def _copy_stream(self, resp: httpx.Response, write: Callable[[bytes], Awaitable[Any]]) -> None:
+        """
+        Copy a streamed response body, coalescing chunks into large writes.
+        
+        Args:
+            resp: Streaming httpx response
+            write: Async write callable of the destination file
+        """
+        buffer = bytearray()
+        async for chunk in resp.aiter_bytes(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+            buffer += chunk
+            if len(buffer) >= self.WRITE_BUFFER_SIZE:
+                await write(bytes(buffer))
+                buffer.clear()
+        if buffer:
+            await write(bytes(buffer))
+    
+    @classmethod
+    async def close(cls) -> None:
+        """
+        Close the shared HTTP client and release pooled connections.
+        """
+        client = InstagramService._http
+        InstagramService._http = None
+        if client is not None and not client.is_closed:
+            await client.aclose()
     
     def extract_shortcode_from_url(self, url: str) -> str:
         """
@@ -129,7 +266,48 @@ class InstagramService(BaseService):
         
         raise ValueError("Could not extract shortcode from URL")
     
-    def determine_post_type(self, url: str) -> str:
+    async def _fetch_post(self, shortcode: str) -> Union[LitePost, "instaloader.Post"]:
+        """
+        Load post metadata by shortcode, reusing recently fetched posts.
+        Queries GraphQL directly over the shared client and falls back to
+        instaloader (in a worker thread) if the direct lookup fails.
+        
+        Args:
+            shortcode: Post shortcode
+            
+        Returns:
+            LitePost, or an instaloader post object from the fallback path
+        """
+        post = InstagramService._post_cache.get(shortcode)
+        if post is None:
+            try:
+                post = await fetch_lite_post(self._get_http_client(), shortcode, self._graphql_headers())
+            except Exception as e:
+                self.logger.warning(f"Direct GraphQL lookup failed, falling back to instaloader: {str(e)}")
+                post = await asyncio.to_thread(instaloader.Post.from_shortcode, self.loader.context, shortcode)
+            InstagramService._post_cache[shortcode] = post
+        return post
+    
+    def _graphql_headers(self) -> Dict[str, str]:
+        """
+        Build GraphQL request headers from the instaloader session, so direct
+        queries carry the same user agent, CSRF token and login cookies.
+        
+        Returns:
+            Request headers
+        """
+        session = self.loader.context._session
+        headers = {
+            key: value for key, value in session.headers.items()
+            if key.lower() not in ("connection", "content-length", "host")
+        }
+        # The anonymous session carries placeholder cookies with empty values
+        cookies = {name: value for name, value in session.cookies.get_dict().items() if value}
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in cookies.items())
+        return headers
+    
+    async def determine_post_type(self, url: str) -> Tuple[str, Union[LitePost, "instaloader.Post"]]:
         """
         Determine the type of Instagram post (video, carousel, or image).
         
@@ -137,7 +315,7 @@ class InstagramService(BaseService):
             url: Instagram post URL
             
         Returns:
-            Post type: 'video', 'carousel', or 'image'
+            Tuple of (post type: 'video', 'carousel', or 'image', loaded post object)
             
         Raises:
             Exception: If post type cannot be determined
@@ -145,14 +323,14 @@ class InstagramService(BaseService):
         try:
             # Extract shortcode and load the post metadata
             shortcode = self.extract_shortcode_from_url(url)
-            post = instaloader.Post.from_shortcode(self.loader.context, shortcode)
+            post = await self._fetch_post(shortcode)
 
             typename = getattr(post, "typename", None)
             self.logger.info(f"Post metadata: is_video={post.is_video}, typename={typename}")
             
             # Check if it's a video
             if post.is_video:
-                return "video"
+                return "video", post
             
             # Check if it's a carousel (multiple media items)
             # Prefer generator API when available
@@ -162,7 +340,7 @@ class InstagramService(BaseService):
                     nodes_list = list(get_nodes())
                     if nodes_list:
                         self.logger.info(f"Detected carousel via get_sidecar_nodes with {len(nodes_list)} items")
-                        return "carousel"
+                        return "carousel", post
             except Exception as _:
                 pass
 
@@ -175,24 +353,25 @@ class InstagramService(BaseService):
                     length = 1
                 if length >= 1:
                     self.logger.info(f"Detected carousel via sidecar_nodes (len={length})")
-                    return "carousel"
+                    return "carousel", post
             if typename and str(typename).lower() == "graphsidecar":
                 self.logger.info("Detected carousel via typename GraphSidecar")
-                return "carousel"
+                return "carousel", post
             
             # If it's not a video and not a carousel, it's a single image
-            return "image"
+            return "image", post
             
         except Exception as e:
             self.logger.error(f"Failed to determine post type: {str(e)}")
             raise Exception(f"Could not determine Instagram post type: {str(e)}")
     
-    async def download_carousel_images(self, url: str) -> List[Path]:
+    async def download_carousel_images(self, url: str, post: Optional[Union[LitePost, "instaloader.Post"]] = None) -> List[Path]:
         """
         Download all images from an Instagram carousel post.
         
         Args:
             url: Instagram post URL
+            post: Already loaded post object; fetched by shortcode when omitted
             
         Returns:
             List of downloaded image file paths
@@ -201,8 +380,8 @@ class InstagramService(BaseService):
             Exception: If download fails
         """
         try:
-            shortcode = self.extract_shortcode_from_url(url)
-            post = instaloader.Post.from_shortcode(self.loader.context, shortcode)
+            if post is None:
+                post = await self._fetch_post(self.extract_shortcode_from_url(url))
 
             nodes_list: List[Any] = []
             get_nodes = getattr(post, "get_sidecar_nodes", None)
@@ -223,68 +402,86 @@ class InstagramService(BaseService):
             if not nodes_list:
                 raise Exception("Post is not a carousel (no sidecar nodes found)")
 
-            self.logger.info(f"Processing carousel with {len(nodes_list)} items")
             
-            image_paths = []
             unique_id = str(post.mediaid)
+            semaphore = asyncio.Semaphore(self.CAROUSEL_DOWNLOAD_CONCURRENCY)
             
+            tasks = []
             for i, node in enumerate(nodes_list):
-                is_video = getattr(node, "is_video", False)
-                self.logger.info(f"Processing carousel item {i+1}/{len(nodes_list)}: is_video={is_video}")
-                
-                if not is_video:  # Only process images, skip videos in carousel
-                    try:
-                        # Download image
-                        image_filename = f"{unique_id}_carousel_{i}.jpg"
-                        image_path = self.media_dir / image_filename
-                        
-                        # Get the image URL - try different possible attributes
-                        image_url = getattr(node, 'display_url', None) or getattr(node, 'url', None)
-                        if not image_url:
-                            self.logger.warning(f"No image URL found for carousel item {i+1}")
-                            continue
-                        
-                        self.logger.info(f"Downloading image from URL: {image_url}")
-                        
-                        # Download image using httpx
-                        async with httpx.AsyncClient(timeout=60, follow_redirects=True) as client:
-                            async with client.stream("GET", image_url) as resp:
-                                resp.raise_for_status()
-                                with open(image_path, "wb") as fp:
-                                    async for chunk in resp.aiter_bytes(chunk_size=1024 * 64):
-                                        if not chunk:
-                                            continue
-                                        fp.write(chunk)
-                        
-                        if image_path.exists() and image_path.stat().st_size > 0:
-                            image_paths.append(image_path)
-                            size_bytes = image_path.stat().st_size
-                            self.logger.info(f"Downloaded carousel image {i+1}/{len(nodes_list)}: {image_path}, size: {size_bytes} bytes")
-                        else:
-                            self.logger.warning(f"Failed to download carousel image {i+1} - file is empty or missing")
-                            
-                    except Exception as e:
-                        self.logger.warning(f"Failed to download carousel image {i+1}: {str(e)}")
-                        continue
-                else:
-                    self.logger.info(f"Skipping video item {i+1} in carousel")
+                if getattr(node, "is_video", False):  # Only process images, skip videos in carousel
+                    continue
+                tasks.append(self._fetch_node(i, node, unique_id, semaphore))
+            
+            # Download all images concurrently; failures of single items are logged, not fatal
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            
+            image_paths = []
+            for result in results:
+                if isinstance(result, asyncio.CancelledError):
+                    # CancelledError is a BaseException, not a failed image; propagate it
+                    raise result
+                if isinstance(result, BaseException):
+                    self.logger.warning(f"Failed to download carousel image: {str(result)}")
+                elif result is not None:
+                    image_paths.append(result)
             
             if not image_paths:
                 raise Exception("No images could be downloaded from carousel")
             
-            self.logger.info(f"Successfully downloaded {len(image_paths)} carousel images")
+            self.logger.info(
+                "Downloaded carousel images",
+                downloaded=len(image_paths),
+                items=len(nodes_list),
+                skipped_videos=len(nodes_list) - len(tasks)
+            )
             return image_paths
             
         except Exception as e:
             self.logger.error(f"Failed to download carousel images: {str(e)}")
             raise Exception(f"Could not download carousel images: {str(e)}")
     
-    async def download_single_image(self, url: str) -> Path:
+    async def _fetch_node(self, i: int, node: Any, unique_id: str, semaphore: asyncio.Semaphore) -> Optional[Path]:
+        """
+        Download a single carousel image node.
+        
+        Args:
+            i: Index of the node in the carousel
+            node: Sidecar node object
+            unique_id: Unique identifier of the parent post
+            semaphore: Semaphore bounding concurrent downloads
+            
+        Returns:
+            Path to the downloaded image, or None if the node could not be downloaded
+        """
+        image_filename = f"{unique_id}_carousel_{i}.jpg"
+        image_path = self.media_dir / image_filename
+        
+        # Get the image URL - try different possible attributes
+        image_url = getattr(node, 'display_url', None) or getattr(node, 'url', None)
+        if not image_url:
+            self.logger.warning(f"No image URL found for carousel item {i+1}")
+            return None
+        
+        # Download image using the shared httpx client
+        async with semaphore:
+            await self._stream_to_file(image_url, image_path)
+        
+        if image_path.exists() and image_path.stat().st_size > 0:
+            if self.logger.is_enabled_for(logging.DEBUG):
+                self.logger.debug("Downloaded carousel image", index=i + 1, path=str(image_path),
+                                  size_bytes=image_path.stat().st_size)
+            return image_path
+        
+        self.logger.warning(f"Failed to download carousel image {i+1} - file is empty or missing")
+        return None
+    
+    async def download_single_image(self, url: str, post: Optional[Union[LitePost, "instaloader.Post"]] = None) -> Path:
         """
         Download a single image from an Instagram post.
         
         Args:
             url: Instagram post URL
+            post: Already loaded post object; fetched by shortcode when omitted
             
         Returns:
             Downloaded image file path
@@ -293,22 +490,15 @@ class InstagramService(BaseService):
             Exception: If download fails
         """
         try:
-            shortcode = self.extract_shortcode_from_url(url)
-            post = instaloader.Post.from_shortcode(self.loader.context, shortcode)
+            if post is None:
+                post = await self._fetch_post(self.extract_shortcode_from_url(url))
             
             unique_id = str(post.mediaid)
             image_filename = f"{unique_id}_single.jpg"
             image_path = self.media_dir / image_filename
             
-            # Download image using httpx
-            async with httpx.AsyncClient(timeout=60, follow_redirects=True) as client:
-                async with client.stream("GET", post.url) as resp:
-                    resp.raise_for_status()
-                    with open(image_path, "wb") as fp:
-                        async for chunk in resp.aiter_bytes(chunk_size=1024 * 64):
-                            if not chunk:
-                                continue
-                            fp.write(chunk)
+            # Download image using the shared httpx client
+            await self._stream_to_file(post.url, image_path)
             
             if not image_path.exists() or image_path.stat().st_size == 0:
                 raise Exception("Downloaded image file is empty or missing")
@@ -320,13 +510,15 @@ class InstagramService(BaseService):
             self.logger.error(f"Failed to download single image: {str(e)}")
             raise Exception(f"Could not download single image: {str(e)}")
     
-    async def create_slideshow_video(self, image_paths: List[Path], duration_per_slide: int = 3) -> Path:
+    async def create_slideshow_video(self, image_paths: List[Path], duration_per_slide: int = 3,
+                                     output_path: Optional[Path] = None) -> Path:
         """
         Create a slideshow video from multiple images.
         
         Args:
             image_paths: List of image file paths
             duration_per_slide: Duration in seconds for each slide
+            output_path: Target video path (defaults to a unique slideshow_*.mp4 in media_dir)
             
         Returns:
             Path to the created video file
@@ -335,42 +527,40 @@ class InstagramService(BaseService):
             Exception: If video creation fails
         """
         try:
-            unique_id = str(uuid.uuid4())
-            output_path = self.media_dir / f"slideshow_{unique_id}.mp4"
+            if output_path is None:
+                output_path = self.media_dir / f"slideshow_{uuid.uuid4()}.mp4"
             
             self.logger.info(f"Creating slideshow video from {len(image_paths)} images", 
                            duration_per_slide=duration_per_slide)
             
-            # Create ffmpeg inputs for each image with scaling and padding
-            inputs = []
-            for i, img_path in enumerate(image_paths):
-                self.logger.info(f"Processing image {i+1}/{len(image_paths)}: {img_path.name}")
-                
-                # Scale and pad image to 1080x1080 (Instagram square format)
-                input_stream = (
-                    ffmpeg
-                    .input(str(img_path), loop=1, t=duration_per_slide)
-                    .filter('scale', 1080, 1080, force_original_aspect_ratio='decrease')
-                    .filter('pad', 1080, 1080, '(ow-iw)/2', '(oh-ih)/2', color='black')
-                )
-                inputs.append(input_stream)
+            # Resize and pad every image once to the square frame size, so ffmpeg
+            # gets uniformly sized frames and needs no scale/pad filter graph
+            slide_paths = list(await asyncio.gather(*(
+                asyncio.to_thread(self._prepare_slide, img_path) for img_path in image_paths
+            )))
             
-            # Concatenate all inputs
-            joined = ffmpeg.concat(*inputs, v=1, a=0)
+            # Describe the slideshow with a concat demuxer list so ffmpeg decodes
+            # all images as one stream instead of one input per image
+            concat_path = output_path.with_name(f"{output_path.stem}_concat.txt")
             
-            # Output video with high quality settings optimized for Instagram
-            (
-                ffmpeg
-                .output(joined, str(output_path), 
-                       vcodec='libx264', 
-                       pix_fmt='yuv420p',
-                       r=30,  # 30 fps
-                       crf=18,  # Very high quality
-                       preset='medium',  # Balance between speed and compression
-                       movflags='faststart')  # Optimize for web streaming
-                .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
-            )
+            try:
+                concat_path.write_text(self._build_concat_list(slide_paths, duration_per_slide))
+                await run_ffmpeg_async(
+                    ffmpeg
+                    .input(str(concat_path), f='concat', safe=0)
+                    .output(str(output_path), 
+                           pix_fmt='yuv420p',
+                           r=30,  # 30 fps
+                           movflags='faststart',  # Optimize for web streaming
+                           **get_h264_encoder_args(self._h264_encoder, crf=18, still_image=True))  # Very high quality
+                    .overwrite_output()
+                )
+            finally:
+                for tmp_path in [concat_path, *slide_paths]:
+                    try:
+                        tmp_path.unlink()
+                    except FileNotFoundError:
+                        pass
             
             if not output_path.exists() or output_path.stat().st_size == 0:
                 raise Exception("Created slideshow video is empty or missing")
@@ -384,13 +574,59 @@ class InstagramService(BaseService):
             self.logger.error(f"Failed to create slideshow video: {str(e)}")
             raise Exception(f"Could not create slideshow video: {str(e)}")
     
-    async def create_static_image_video(self, image_path: Path, duration: int = 1) -> Path:
+    def _prepare_slide(self, image_path: Path) -> Path:
+        """
+        Resize an image to fit the square slide and pad it with black borders.
+        
+        Args:
+            image_path: Path to the source image
+            
+        Returns:
+            Path to the prepared SLIDE_SIZE x SLIDE_SIZE JPEG
+        """
+        size = self.SLIDE_SIZE
+        slide_path = image_path.with_name(f"{image_path.stem}_slide.jpg")
+        
+        with Image.open(image_path) as img:
+            img = img.convert("RGB")
+            img.thumbnail((size, size), Image.LANCZOS)
+            canvas = Image.new("RGB", (size, size), "black")
+            canvas.paste(img, ((size - img.width) // 2, (size - img.height) // 2))
+            canvas.save(slide_path, "JPEG", quality=95)
+        
+        return slide_path
+    
+    @staticmethod
+    def _build_concat_list(image_paths: List[Path], duration_per_slide: int) -> str:
+        """
+        Build an ffmpeg concat demuxer list showing each image for a fixed duration.
+        
+        Args:
+            image_paths: List of image file paths
+            duration_per_slide: Duration in seconds for each slide
+            
+        Returns:
+            Contents of the concat list file
+        """
+        lines = []
+        for img_path in image_paths:
+            escaped = str(img_path.resolve()).replace("'", "'\\''")
+            lines.append(f"file '{escaped}'")
+            lines.append(f"duration {duration_per_slide}")
+        # The concat demuxer ignores the duration of the last entry unless the file is repeated
+        if image_paths:
+            lines.append(lines[-2])
+        return "\n".join(lines) + "\n"
+    
+    async def create_static_image_video(self, image_path: Path, duration: int = 1,
+                                        output_path: Optional[Path] = None) -> Path:
         """
         Create a video from a single static image.
         
         Args:
             image_path: Path to the image file
             duration: Duration in seconds for the video
+            output_path: Target video path (defaults to a unique static_*.mp4 in media_dir)
             
         Returns:
             Path to the created video file
@@ -399,22 +635,20 @@ class InstagramService(BaseService):
             Exception: If video creation fails
         """
         try:
-            unique_id = str(uuid.uuid4())
-            output_path = self.media_dir / f"static_{unique_id}.mp4"
+            if output_path is None:
+                output_path = self.media_dir / f"static_{uuid.uuid4()}.mp4"
             
             self.logger.info(f"Creating static image video: {image_path}, duration: {duration}s")
             
             # Create video from static image
-            (
+            await run_ffmpeg_async(
                 ffmpeg
                 .input(str(image_path), loop=1, t=duration)
                 .output(str(output_path), 
-                       vcodec='libx264', 
                        pix_fmt='yuv420p',
                        r=30,  # 30 fps
-                       crf=23)  # High quality
+                       **get_h264_encoder_args(self._h264_encoder, crf=23, still_image=True))  # High quality
                 .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
             )
             
             if not output_path.exists() or output_path.stat().st_size == 0:
@@ -434,19 +668,32 @@ class InstagramService(BaseService):
         Args:
             image_paths: List of image file paths to remove
         """
-        deleted_count = 0
-        for path in image_paths:
-            try:
-                if path.exists():
-                    path.unlink()
-                    deleted_count += 1
-                    self.logger.info(f"Cleaned up temporary image: {path}")
-            except Exception as e:
-                self.logger.warning(f"Failed to remove temporary image {path}: {str(e)}")
+        results = await asyncio.gather(*(self._remove_file(path) for path in image_paths))
+        deleted_count = sum(results)
         
         if deleted_count > 0:
             self.logger.info(f"Cleaned up {deleted_count} temporary image files")
     
+    async def _remove_file(self, path: Path) -> bool:
+        """
+        Remove a single temporary file without blocking the event loop.
+        
+        Args:
+            path: File path to remove
+            
+        Returns:
+            True if the file was removed
+        """
+        try:
+            await aiofiles.os.remove(path)
+            self.logger.debug("Cleaned up temporary image", path=str(path))
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            self.logger.warning(f"Failed to remove temporary image {path}: {str(e)}")
+            return False
+    
     async def create_empty_audio_file(self, video_path: Path) -> Path:
         """
         Create an empty audio file to maintain consistent response structure.
@@ -461,25 +708,63 @@ class InstagramService(BaseService):
             audio_filename = video_path.stem
             audio_path = self.media_dir / f"{audio_filename}.mp3"
             
-            # Create a silent audio file using ffmpeg
-            (
-                ffmpeg
-                .input('anullsrc', f='lavfi', t=1)  # 1 second of silence
-                .output(str(audio_path), format='mp3')
-                .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
-            )
+            # Every silent track is identical, so copy the cached one instead of running ffmpeg
+            silence_path = await self._get_silence_template()
+            await asyncio.to_thread(shutil.copyfile, silence_path, audio_path)
             
-            if audio_path.exists():
-                self.logger.info(f"Created empty audio file: {audio_path}")
-                return audio_path
-            else:
-                raise Exception("Empty audio file was not created")
+            self.logger.debug("Created empty audio file", path=str(audio_path))
+            return audio_path
                 
         except Exception as e:
             self.logger.error(f"Failed to create empty audio file: {str(e)}")
             raise Exception(f"Could not create empty audio file: {str(e)}")
+    
+    async def _get_silence_template(self) -> Path:
+        """
+        Return the cached 1-second silent MP3, generating it on first use.
+        
+        Returns:
+            Path to the silent audio template
+        """
+        silence_path = self.media_dir / self.SILENCE_TEMPLATE_NAME
+        if fast_exists(silence_path):
+            return silence_path
+        
+        # Render to a unique temp file and rename, so concurrent first requests never see a partial file
+        temp_path = self.media_dir / f"{self.SILENCE_TEMPLATE_NAME}.{uuid.uuid4().hex}.part"
+        try:
+            await run_ffmpeg_async(
+                ffmpeg
+                .input('anullsrc', f='lavfi', t=1)  # 1 second of silence
+                .output(str(temp_path), format='mp3')
+                .overwrite_output()
+            )
+            os.replace(temp_path, silence_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        
+        self.logger.info(f"Created silent audio template: {silence_path}")
+        return silence_path
+    
+    async def _create_silent_audio(self, video_path: Path) -> Optional[str]:
+        """
+        Create the silent audio track for a post and return its public URL.
         
+        Args:
+            video_path: Path to the video file (for naming)
+            
+        Returns:
+            Public audio URL, or None if the audio file could not be created
+        """
+        try:
+            empty_audio_path = await self.create_empty_audio_file(video_path)
+            self.logger.info("Created empty audio file for post without audio")
+            return f"{AppConfig.BASE_URL}/static/{empty_audio_path.name}"
+        except Exception as e:
+            self.logger.warning(f"Failed to create empty audio file: {str(e)}")
+            return None
+    
     async def download_post(self, url: str) -> Tuple[str, Dict[str, Any]]:
         """
         Download a post and return the file path and metadata.
@@ -495,20 +780,16 @@ class InstagramService(BaseService):
             Exception: If download fails
         """
         try:
-            # Determine post type first
-            post_type = self.determine_post_type(url)
+            # Determine post type first; the loaded post is reused by every branch
+            post_type, post = await self.determine_post_type(url)
             self.logger.info(f"Detected Instagram post type: {post_type}")
             
-            # Extract shortcode and load the post metadata
-            shortcode = self.extract_shortcode_from_url(url)
-            post = instaloader.Post.from_shortcode(self.loader.context, shortcode)
-            
             # Choose a stable unique identifier for filenames (mediaid is globally unique)
             unique_id = str(post.mediaid)
             target_mp4 = self.media_dir / f"{unique_id}.mp4"
             
             # Fast path: if already downloaded, return cached metadata
-            if target_mp4.exists():
+            if fast_exists(target_mp4):
                 metadata = self._build_metadata_from_files(
                     post=post,
                     unique_id=unique_id,
@@ -518,36 +799,41 @@ class InstagramService(BaseService):
                 return target_mp4.name, metadata
             
             # Process based on post type
+            audio_url: Optional[str] = None
+            cleanup_paths: List[Path] = []
             if post_type == "video":
                 # Use existing video download logic
                 target_mp4 = await self._download_video_post(post, unique_id)
                 
             elif post_type == "carousel":
-                # Download carousel images and create slideshow video
-                image_paths = await self.download_carousel_images(url)
-                target_mp4 = await self.create_slideshow_video(image_paths, duration_per_slide=3)
-                # Clean up temporary images
-                await self.cleanup_image_files(image_paths)
+                # Download carousel images and create slideshow video;
+                # slides have no audio track, so the silent audio is created alongside the encode
+                image_paths = await self.download_carousel_images(url, post=post)
+                target_mp4 = self.media_dir / f"slideshow_{uuid.uuid4()}.mp4"
+                cleanup_paths = list(image_paths)
+                if len(image_paths) == 1:
+                    # Only one downloadable slide (the rest were videos): no concat pipeline needed,
+                    # but the slide is still squared so odd dimensions can't break yuv420p encoding
+                    slide_path = await asyncio.to_thread(self._prepare_slide, image_paths[0])
+                    cleanup_paths.append(slide_path)
+                    create_video = self.create_static_image_video(slide_path, duration=3, output_path=target_mp4)
+                else:
+                    create_video = self.create_slideshow_video(image_paths, duration_per_slide=3, output_path=target_mp4)
+                _, audio_url = await asyncio.gather(create_video, self._create_silent_audio(target_mp4))
                 
             elif post_type == "image":
-                # Download single image and create static video
-                image_path = await self.download_single_image(url)
-                target_mp4 = await self.create_static_image_video(image_path, duration=1)
-                # Clean up temporary image
-                await self.cleanup_image_files([image_path])
+                # Download single image and create static video alongside its silent audio
+                image_path = await self.download_single_image(url, post=post)
+                target_mp4 = self.media_dir / f"static_{uuid.uuid4()}.mp4"
+                _, audio_url = await asyncio.gather(
+                    self.create_static_image_video(image_path, duration=1, output_path=target_mp4),
+                    self._create_silent_audio(target_mp4),
+                )
+                cleanup_paths = [image_path]
                 
             else:
                 raise Exception(f"Unsupported Instagram post type: {post_type}")
             
-            # Persist caption and metadata for idempotent reads
-            target_txt = self.media_dir / f"{unique_id}.txt"
-            target_json = self.media_dir / f"{unique_id}.json"
-            
-            try:
-                target_txt.write_text(post.caption or "")
-            except Exception:
-                pass
-
             # Build metadata
             metadata = {
                 "author": post.owner_username,
@@ -556,36 +842,24 @@ class InstagramService(BaseService):
                 "video_url": f"{AppConfig.BASE_URL}/static/{target_mp4.name}",
             }
             
-            try:
-                target_json.write_text(json.dumps({
-                    "shortcode": post.shortcode,
-                    "mediaid": unique_id,
-                    "owner_username": post.owner_username,
-                    "date": post.date.isoformat(),
-                    "caption": post.caption or "",
-                    "post_type": post_type,
-                }, ensure_ascii=False))
-            except Exception:
-                pass
-
-            # Extract audio from video after successful download
-            audio_extracted, audio_url = self._extract_audio_from_video(target_mp4)
-            
-            # If audio extraction failed (e.g., for static images), create empty audio
-            if not audio_extracted:
-                try:
-                    empty_audio_path = await self.create_empty_audio_file(target_mp4)
-                    audio_url = f"{AppConfig.BASE_URL}/static/{empty_audio_path.name}"
-                    self.logger.info("Created empty audio file for post without audio")
-                except Exception as e:
-                    self.logger.warning(f"Failed to create empty audio file: {str(e)}")
-                    audio_url = None
+            # Remaining stages are independent: persist sidecars, remove temporary
+            # images and extract audio from videos at the same time
+            jobs: List[Awaitable[Any]] = [
+                self._write_sidecar_files(post, unique_id, post_type)
+            ]
+            if cleanup_paths:
+                jobs.append(self.cleanup_image_files(cleanup_paths))
+            if post_type == "video":
+                jobs.append(self._extract_or_create_audio(target_mp4))
+            results = await asyncio.gather(*jobs)
+            if post_type == "video":
+                audio_url = results[-1]
             
             # Add audio URL to metadata
             metadata["audio_url"] = audio_url
             
-            # Clean up old files after successful download
-            self._cleanup_old_files()
+            # Clean up old files after successful download; not needed for the response, so it finishes in the background
+            self._spawn_background(asyncio.to_thread(self._cleanup_old_files))
             
             return target_mp4.name, metadata
 
@@ -598,6 +872,54 @@ class InstagramService(BaseService):
         except Exception as e:
             raise Exception(f"Error downloading Instagram post: {str(e)}")
     
+    async def _write_sidecar_files(self, post: "instaloader.Post", unique_id: str, post_type: str) -> None:
+        """
+        Persist caption and metadata next to the video for idempotent reads.
+        
+        Args:
+            post: Instagram post object
+            unique_id: Unique identifier for the post
+            post_type: Detected post type
+        """
+        caption = post.caption or ""
+        metadata_json = orjson.dumps({
+            "shortcode": post.shortcode,
+            "mediaid": unique_id,
+            "owner_username": post.owner_username,
+            "date": post.date.isoformat(),
+            "caption": caption,
+            "post_type": post_type,
+        })
+        
+        # Sidecars are a cache; a failed write only costs a refetch later
+        results = await asyncio.gather(
+            self._write_file(self.media_dir / f"{unique_id}.txt", caption.encode("utf-8")),
+            self._write_file(self.media_dir / f"{unique_id}.json", metadata_json),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, OSError):
+                self.logger.warning(f"Failed to write sidecar file: {str(result)}")
+            elif isinstance(result, BaseException):
+                raise result
+    
+    async def _extract_or_create_audio(self, video_path: Path) -> Optional[str]:
+        """
+        Extract the audio track of a video, falling back to silent audio.
+        
+        Args:
+            video_path: Path to the video file
+            
+        Returns:
+            URL of the audio file, or None if neither could be created
+        """
+        audio_extracted, audio_url = await self._extract_audio_async(video_path)
+        
+        # If audio extraction failed (e.g., video without audio track), create empty audio
+        if not audio_extracted:
+            audio_url = await self._create_silent_audio(video_path)
+        return audio_url
+    
     async def _download_video_post(self, post: "instaloader.Post", unique_id: str) -> Path:
         """
         Download a video post using the existing logic.
@@ -624,14 +946,7 @@ class InstagramService(BaseService):
             except Exception:
                 pass
                 
-        async with httpx.AsyncClient(timeout=60, follow_redirects=True) as client:
-            async with client.stream("GET", video_url) as resp:
-                resp.raise_for_status()
-                with open(temp_path, "wb") as fp:
-                    async for chunk in resp.aiter_bytes(chunk_size=1024 * 64):
-                        if not chunk:
-                            continue
-                        fp.write(chunk)
+        await self._stream_to_file(video_url, temp_path, large_file=True)
         
         # Ensure file is non-empty and move into place
         if not temp_path.exists() or temp_path.stat().st_size == 0:
@@ -641,16 +956,8 @@ class InstagramService(BaseService):
                 pass
             raise Exception("Downloaded video file is empty or missing")
             
-        try:
-            temp_path.replace(target_mp4)
-        except Exception:
-            # Fallback copy
-            data = temp_path.read_bytes()
-            target_mp4.write_bytes(data)
-            try:
-                temp_path.unlink()
-            except Exception:
-                pass
+        # Temp and target both live in media_dir, so the rename is always same-filesystem and atomic
+        os.replace(temp_path, target_mp4)
         
         return target_mp4
 
@@ -662,7 +969,7 @@ class InstagramService(BaseService):
         """
         description = ""
         try:
-            if target_txt.exists():
+            if fast_exists(target_txt):
                 description = target_txt.read_text(errors="ignore").strip()
         except Exception:
             description = ""
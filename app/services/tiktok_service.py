@@ -1,14 +1,50 @@
+import asyncio
 import logging
 from pathlib import Path
-from typing import Dict, Tuple, Any
-import os
+from types import MappingProxyType
+from typing import Dict, Tuple, Any, Mapping
 import re
-import json
+import orjson
 from datetime import datetime
-import yt_dlp
-import glob
 from .base_service import BaseService
 from app.config import AppConfig
+from app.utils.exceptions import ValidationError
+from app.utils.url_validator import classify_url
+
+# Precompiled patterns for _extract_video_id
+_VIDEO_ID_RE = re.compile(r"/video/(\d+)")
+_FALLBACK_RE = re.compile(r"[^A-Za-z0-9]+")
+_MAX_URL_LENGTH = 2048
+
+# info dict fields tried in order for the video description
+_DESCRIPTION_FIELDS = ('description', 'title', 'fulltitle', 'alt_title')
+
+# Static yt-dlp options shared by every request; only 'outtmpl' is set per call
+_YDL_OPTS_BASE: Mapping[str, Any] = MappingProxyType({
+    'format': 'best[ext=mp4]/best',
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': False,
+    'writethumbnail': False,
+    'writeinfojson': False,
+    'writesubtitles': False,
+    'writeautomaticsub': False,
+    'ignoreerrors': False,
+    'no_check_certificate': True,
+    # Fetch HLS/DASH fragments in parallel; range-request progressive downloads in 10 MiB chunks
+    'concurrent_fragment_downloads': 4,
+    'http_chunk_size': 10 * 1024 * 1024,
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'referer': 'https://www.tiktok.com/',
+    'headers': MappingProxyType({
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-us,en;q=0.5',
+        'Accept-Encoding': 'gzip, deflate',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+    }),
+})
 
 
 class TikTokService(BaseService):
@@ -30,13 +66,30 @@ class TikTokService(BaseService):
         """
         Extract a stable identifier from common TikTok URL formats.
         """
-        m = re.search(r"/video/(\d+)", url)
+        m = _VIDEO_ID_RE.search(url)
         if m:
             return m.group(1)
-        # fallback: strip non-filename chars for cache key
-        return re.sub(r"[^A-Za-z0-9]+", "", url)[:32]
+        # fallback: strip non-filename chars for cache key (input capped so huge URLs stay cheap)
+        return _FALLBACK_RE.sub("", url[:_MAX_URL_LENGTH])[:32]
     
 
+    def _run_ydl(self, url: str, ydl_opts: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Download a video with yt-dlp and return its info dict (blocking).
+
+        Args:
+            url: TikTok video URL
+            ydl_opts: yt-dlp options
+
+        Returns:
+            yt-dlp info dict (may be empty if extraction failed)
+        """
+        # Imported on first use: yt-dlp pulls in hundreds of extractor modules at import time
+        import yt_dlp
+        
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            return ydl.extract_info(url, download=True)
+
     async def download_post(self, url: str) -> Tuple[str, Dict[str, Any]]:
         """
         Download a TikTok video using yt-dlp and return the file name and metadata.
@@ -46,124 +99,120 @@ class TikTokService(BaseService):
 
         Returns:
             Tuple of (filename, metadata_dict)
+
+        Raises:
+            ValidationError: If the URL is not a TikTok URL
         """
+        # Same check the router dispatches on, so malformed URLs are rejected before yt-dlp spins up
+        if classify_url(url) != 'tiktok':
+            raise ValidationError("Not a TikTok URL", details={"url": url[:_MAX_URL_LENGTH]})
+        
         try:
             # Extract video ID for filename
             unique_id = self._extract_video_id(url)
             target_mp4 = self.media_dir / f"{unique_id}.mp4"
-            target_json = self.media_dir / f"{unique_id}.json"
-            target_txt = self.media_dir / f"{unique_id}.txt"
 
-            # Check if already downloaded
-            if target_mp4.exists():
-                metadata = self._build_metadata(unique_id, "unknown", "", target_mp4)
-                return target_mp4.name, metadata
+            # Check if already downloaded (in-memory index, no filesystem lookup on a miss)
+            known_ids = self._known_video_ids()
+            if unique_id in known_ids:
+                try:
+                    metadata = self._build_metadata(unique_id, "unknown", "", target_mp4)
+                    return target_mp4.name, metadata
+                except FileNotFoundError:
+                    # Removed outside the service; download it again
+                    known_ids.discard(unique_id)
 
             # Configure yt-dlp options for TikTok
-            ydl_opts = {
-                'outtmpl': str(target_mp4),
-                'format': 'best[ext=mp4]/best',
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': False,
-                'writethumbnail': False,
-                'writeinfojson': False,
-                'writesubtitles': False,
-                'writeautomaticsub': False,
-                'ignoreerrors': False,
-                'no_check_certificate': True,
-                'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'referer': 'https://www.tiktok.com/',
-                'headers': {
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Accept-Language': 'en-us,en;q=0.5',
-                    'Accept-Encoding': 'gzip, deflate',
-                    'DNT': '1',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1',
-                }
-            }
-
-            # Use yt-dlp to download video and extract metadata
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Extract info first
-                info = ydl.extract_info(url, download=False)
-                
-                if not info:
-                    raise Exception("Could not extract video information from TikTok URL")
-                
-                # Get metadata
-                author = info.get('uploader', 'unknown')
-                # Try to get full description from multiple fields
-                description = (info.get('description', '') or 
-                              info.get('title', '') or 
-                              info.get('fulltitle', '') or
-                              info.get('alt_title', ''))
-                upload_date = info.get('upload_date', '')
-                
-                # Log available fields for debugging
-                self.logger.info(f"TikTok metadata fields: {list(info.keys())}")
-                self.logger.info(f"Description length: {len(description)} chars")
+            ydl_opts = {**_YDL_OPTS_BASE, 'outtmpl': str(target_mp4)}
+
+            # Download the video and extract its metadata in a single pass, off the event loop
+            info = await asyncio.to_thread(self._run_ydl, url, ydl_opts)
+            
+            if not info:
+                raise Exception("Could not extract video information from TikTok URL")
+            
+            # Get metadata
+            author = info.get('uploader', 'unknown')
+            # Try to get full description from multiple fields
+            description = next(filter(None, (info.get(key) for key in _DESCRIPTION_FIELDS)), '')
+            upload_date = info.get('upload_date', '')
+            
+            # Log available fields for debugging
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"TikTok metadata fields: {list(info.keys())}")
+                self.logger.debug(f"Description length: {len(description)} chars")
                 preview = description[:100] + "..." if len(description) > 100 else description
-                self.logger.info(f"Description preview: {preview}")
-                
-                # Convert upload_date to datetime if available
-                created_at = datetime.now()
-                if upload_date:
-                    try:
-                        created_at = datetime.strptime(upload_date, '%Y%m%d')
-                    except ValueError:
-                        pass
-                
-                # Download the video
-                ydl.download([url])
-                
-                # Verify download
-                if not target_mp4.exists() or target_mp4.stat().st_size == 0:
-                    raise Exception("Downloaded video file is empty or missing")
-
-                # Save metadata files
+                self.logger.debug(f"Description preview: {preview}")
+            
+            # Convert upload_date to datetime if available
+            created_at = datetime.now()
+            if upload_date and len(upload_date) == 8 and upload_date.isdigit():
+                # Fixed YYYYMMDD layout: slice instead of running strptime's format parser
                 try:
-                    target_txt.write_text(description)
-                except Exception:
+                    created_at = datetime(int(upload_date[0:4]), int(upload_date[4:6]), int(upload_date[6:8]))
+                except ValueError:
                     pass
-
-                metadata = {
-                    "author": author,
-                    "description": description,
-                    "created_at": created_at,
-                    "video_url": f"{AppConfig.BASE_URL}/static/{target_mp4.name}",
-                }
-                
-                try:
-                    target_json.write_text(json.dumps({
-                        "video_id": unique_id,
-                        "author": author,
-                        "description": description,
-                        "date": created_at.isoformat(),
-                        "upload_date": upload_date,
-                    }, ensure_ascii=False))
-                except Exception:
-                    pass
-
-                # Extract audio from video after successful download
-                audio_extracted, audio_url = self._extract_audio_from_video(target_mp4)
-                
-                # Add audio URL to metadata if extraction was successful
-                if audio_extracted:
-                    metadata["audio_url"] = audio_url
-                else:
-                    metadata["audio_url"] = None
-
-                # Clean up old files after successful download
-                self._cleanup_old_files()
-
-                return target_mp4.name, metadata
+            
+            # Verify download
+            if not target_mp4.exists() or target_mp4.stat().st_size == 0:
+                raise Exception("Downloaded video file is empty or missing")
+            known_ids.add(unique_id)
+
+            metadata = {
+                "author": author,
+                "description": description,
+                "created_at": created_at,
+                "video_url": f"{AppConfig.BASE_URL}/static/{target_mp4.name}",
+            }
+            
+            # Sidecars and old-file cleanup aren't needed for the response, so they finish in the background
+            self._spawn_background(self._write_sidecar_files(unique_id, author, description, created_at, upload_date))
+            self._spawn_background(asyncio.to_thread(self._cleanup_old_files))
+            
+            audio_extracted, audio_url = await self._extract_audio_async(target_mp4)
+            
+            # Add audio URL to metadata if extraction was successful
+            metadata["audio_url"] = audio_url if audio_extracted else None
+
+            return target_mp4.name, metadata
 
         except Exception as e:
             self.logger.error(f"TikTok download error: {str(e)}")
             raise Exception(f"Error downloading TikTok video: {str(e)}")
 
+    async def _write_sidecar_files(self, unique_id: str, author: str, description: str,
+                                   created_at: datetime, upload_date: str) -> None:
+        """
+        Persist description and metadata next to the video, writing both files concurrently.
+
+        Args:
+            unique_id: TikTok video ID
+            author: Video author
+            description: Video description
+            created_at: Upload datetime
+            upload_date: Raw yt-dlp upload date (YYYYMMDD)
+        """
+        # orjson emits UTF-8 and serializes datetimes natively (same ISO layout as isoformat())
+        metadata_json = orjson.dumps({
+            "video_id": unique_id,
+            "author": author,
+            "description": description,
+            "date": created_at,
+            "upload_date": upload_date,
+        })
+        
+        # Sidecars are a cache; a failed write is logged and otherwise ignored
+        results = await asyncio.gather(
+            self._write_file(self.media_dir / f"{unique_id}.txt", description.encode("utf-8")),
+            self._write_file(self.media_dir / f"{unique_id}.json", metadata_json),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, OSError):
+                self.logger.warning(f"Failed to write sidecar file: {str(result)}")
+            elif isinstance(result, BaseException):
+                raise result
+
     def _build_metadata(self, unique_id: str, author: str, description: str, target_mp4: Path) -> Dict[str, Any]:
         """
         Build metadata dict from saved files and parameters.
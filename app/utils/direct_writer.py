@@ -0,0 +1,179 @@
+"""
+O_DIRECT file writer for large streamed media downloads.
+Bypasses the page cache so multi-hundred-MB videos don't evict hot pages; callers
+fall back to buffered writes when the platform or filesystem doesn't support it.
+"""
+
+import asyncio
+import errno
+import mmap
+import os
+from pathlib import Path
+
+# O_DIRECT only exists on Linux (and a few BSDs)
+O_DIRECT: int = getattr(os, "O_DIRECT", 0)
+
+# True when O_DIRECT writes can be attempted on this host
+DIRECT_IO_AVAILABLE: bool = O_DIRECT != 0
+
+
+class DirectWriter:
+    """
+    Sequential file writer that stages data in a page-aligned buffer and writes
+    whole aligned blocks through an O_DIRECT descriptor. The unaligned tail, the
+    remainder of short writes and, if the filesystem rejects O_DIRECT writes,
+    everything else go through a regular descriptor.
+
+    Usage:
+        writer = DirectWriter(path)
+        writer.open()
+        try:
+            for chunk in chunks:
+                await writer.write(chunk)
+            await writer.flush()
+        finally:
+            writer.close()
+    """
+
+    # Covers the logical block size of common devices (512 B or 4 KiB)
+    BLOCK_SIZE = 4096
+
+    def __init__(self, path: Path, buffer_size: int = 8 * 1024 * 1024):
+        """
+        Args:
+            path: Destination file path (created or truncated)
+            buffer_size: Staging buffer size, rounded up to a multiple of BLOCK_SIZE
+        """
+        self.path = Path(path)
+        blocks = max(1, -(-buffer_size // self.BLOCK_SIZE))
+        self._buffer_size = blocks * self.BLOCK_SIZE
+        self._buffer = None
+        self._used = 0
+        self._offset = 0
+        self._fd = -1
+        # Regular descriptor, opened on first use
+        self._buffered_fd = -1
+
+    def open(self) -> None:
+        """
+        Open the destination file with O_DIRECT and allocate the staging buffer.
+
+        Raises:
+            OSError: If O_DIRECT is unsupported by the platform or filesystem (e.g. tmpfs)
+        """
+        if not DIRECT_IO_AVAILABLE:
+            raise OSError("O_DIRECT is not available on this host")
+
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | O_DIRECT, 0o644)
+        # Anonymous mmap memory is page-aligned, as O_DIRECT requires
+        self._buffer = mmap.mmap(-1, self._buffer_size)
+
+    async def write(self, chunk: bytes) -> None:
+        """
+        Append a chunk, writing the staging buffer out whenever it fills.
+
+        Args:
+            chunk: Bytes to append to the file
+        """
+        if len(chunk) > self._buffer_size - self._used:
+            await asyncio.to_thread(self._fill, chunk)
+        else:
+            self._fill(chunk)
+
+    def _fill(self, chunk: bytes) -> None:
+        """
+        Copy a chunk into the staging buffer, writing out each full buffer.
+        """
+        view = memoryview(chunk)
+        while view:
+            take = min(len(view), self._buffer_size - self._used)
+            self._buffer[self._used:self._used + take] = view[:take]
+            self._used += take
+            view = view[take:]
+            if self._used == self._buffer_size:
+                self._write_aligned(self._buffer_size)
+
+    def _write_aligned(self, length: int) -> None:
+        """
+        Write the first `length` bytes of the staging buffer (a BLOCK_SIZE multiple).
+
+        Raises:
+            OSError: If the write fails
+        """
+        view = memoryview(self._buffer)[:length]
+        try:
+            written = self._write_direct(view) if self._fd >= 0 else 0
+            while written < length:
+                written += os.pwrite(self._get_buffered_fd(), view[written:], self._offset + written)
+        finally:
+            view.release()
+        self._offset += length
+        self._used = 0
+
+    def _write_direct(self, view: memoryview) -> int:
+        """
+        Write an aligned view through the O_DIRECT descriptor.
+
+        Returns:
+            Number of bytes written, rounded down to a BLOCK_SIZE multiple, so the
+            remainder can be rewritten from an aligned offset
+
+        Raises:
+            OSError: If the write fails (other than O_DIRECT being rejected up front)
+        """
+        try:
+            written = os.pwrite(self._fd, view, self._offset)
+        except OSError as e:
+            # Some filesystems accept the O_DIRECT open but reject the writes themselves
+            if e.errno != errno.EINVAL or self._offset != 0:
+                raise
+            os.close(self._fd)
+            self._fd = -1
+            return 0
+        return written - written % self.BLOCK_SIZE
+
+    def _get_buffered_fd(self) -> int:
+        """
+        Return the regular (page cache) descriptor, opening it on first use.
+        """
+        if self._buffered_fd < 0:
+            self._buffered_fd = os.open(self.path, os.O_WRONLY)
+        return self._buffered_fd
+
+    async def flush(self) -> None:
+        """
+        Write all staged data, including the unaligned tail.
+        """
+        await asyncio.to_thread(self._flush)
+
+    def _flush(self) -> None:
+        tail = self._used % self.BLOCK_SIZE
+        aligned = self._used - tail
+        if aligned:
+            tail_bytes = self._buffer[aligned:self._used]
+            self._write_aligned(aligned)
+        else:
+            tail_bytes = self._buffer[:tail]
+
+        if tail:
+            # O_DIRECT rejects partial blocks, so the tail goes through the page cache
+            view = memoryview(tail_bytes)
+            written = 0
+            while written < tail:
+                written += os.pwrite(self._get_buffered_fd(), view[written:], self._offset + written)
+            self._offset += tail
+        self._used = 0
+
+    def close(self) -> None:
+        """
+        Close the file descriptor and release the staging buffer.
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        if self._buffered_fd >= 0:
+            os.close(self._buffered_fd)
+            self._buffered_fd = -1
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
@@ -3,7 +3,8 @@ Centralized exception handling for the Instagram Downloader API.
 Provides custom exceptions and error handling utilities.
 """
 
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Mapping
 from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
 import logging
@@ -102,6 +103,18 @@ def create_error_response(
     )
 
 
+# Map error codes to HTTP status codes
+_STATUS_CODE_MAP: Mapping[str, int] = MappingProxyType({
+    "CONFIG_ERROR": 500,
+    "VALIDATION_ERROR": 400,
+    "MEDIA_PROCESSING_ERROR": 422,
+    "AUDIO_EXTRACTION_ERROR": 422,
+    "VIDEO_DOWNLOAD_ERROR": 422,
+    "SERVICE_ERROR": 503,
+    "UNKNOWN_ERROR": 500
+})
+
+
 def handle_instagram_downloader_error(request: Request, exc: InstagramDownloaderError) -> JSONResponse:
     """
     Handle InstagramDownloaderError exceptions.
@@ -116,18 +129,7 @@ def handle_instagram_downloader_error(request: Request, exc: InstagramDownloader
         }
     )
     
-    # Map error codes to HTTP status codes
-    status_code_map = {
-        "CONFIG_ERROR": 500,
-        "VALIDATION_ERROR": 400,
-        "MEDIA_PROCESSING_ERROR": 422,
-        "AUDIO_EXTRACTION_ERROR": 422,
-        "VIDEO_DOWNLOAD_ERROR": 422,
-        "SERVICE_ERROR": 503,
-        "UNKNOWN_ERROR": 500
-    }
-    
-    status_code = status_code_map.get(exc.error_code, 500)
+    status_code = _STATUS_CODE_MAP.get(exc.error_code, 500)
     
     return create_error_response(
         status_code=status_code,
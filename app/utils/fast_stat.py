@@ -0,0 +1,69 @@
+"""
+Cheap existence checks for files in the media directory.
+Uses Linux statx(2) with AT_STATX_DONT_SYNC and a STATX_TYPE-only mask, so network or
+FUSE-backed media directories answer from cached attributes; falls back to os.path.exists.
+"""
+
+import ctypes
+import errno
+import functools
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+AT_FDCWD = -100
+AT_STATX_DONT_SYNC = 0x4000
+STATX_TYPE = 0x0001
+
+# sizeof(struct statx) is fixed at 256 bytes by the kernel ABI
+_STATX_BUF_SIZE = 256
+
+
+@functools.cache
+def _get_statx() -> Optional[Callable[..., int]]:
+    """
+    Resolve glibc's statx wrapper once (glibc >= 2.28, kernel >= 4.11).
+
+    Returns:
+        The ctypes function, or None if statx is unavailable
+    """
+    if sys.platform != "linux":
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        statx = libc.statx
+    except (OSError, AttributeError):
+        return None
+
+    statx.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_uint, ctypes.c_void_p]
+    statx.restype = ctypes.c_int
+
+    # Probe once: seccomp profiles or old kernels reject the syscall with ENOSYS/EPERM
+    buf = ctypes.create_string_buffer(_STATX_BUF_SIZE)
+    if statx(AT_FDCWD, b".", AT_STATX_DONT_SYNC, STATX_TYPE, buf) != 0:
+        return None
+    return statx
+
+
+def fast_exists(path: Union[str, Path]) -> bool:
+    """
+    Check whether a path exists, like Path.exists().
+
+    Args:
+        path: Path to check
+
+    Returns:
+        True if the path exists
+    """
+    statx = _get_statx()
+    if statx is None:
+        return os.path.exists(path)
+
+    buf = ctypes.create_string_buffer(_STATX_BUF_SIZE)
+    if statx(AT_FDCWD, os.fsencode(path), AT_STATX_DONT_SYNC, STATX_TYPE, buf) == 0:
+        return True
+    if ctypes.get_errno() in (errno.ENOENT, errno.ENOTDIR):
+        return False
+    # Unexpected errors (e.g. EACCES) get the same treatment as Path.exists()
+    return os.path.exists(path)
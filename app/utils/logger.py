@@ -3,11 +3,11 @@ Centralized logging utilities for the Instagram Downloader API.
 Provides structured logging, request/response logging, and error handling.
 """
 
+import functools
 import logging
-import json
+import orjson
 import time
 from typing import Dict, Any, Optional
-from datetime import datetime
 from pathlib import Path
 
 from app.config import AppConfig
@@ -25,23 +25,24 @@ class StructuredLogger:
     def _log_structured(self, level: int, message: str, **kwargs):
         """
         Log a structured message with additional context.
+        Nothing is serialized when the level is disabled.
         """
+        if not self.logger.isEnabledFor(level):
+            return
+        
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": time.time(),
             "level": logging.getLevelName(level),
             "logger": self.name,
             "message": message,
             **kwargs
         }
         
-        if level >= logging.ERROR:
-            self.logger.error(json.dumps(log_data, default=str))
-        elif level >= logging.WARNING:
-            self.logger.warning(json.dumps(log_data, default=str))
-        elif level >= logging.INFO:
-            self.logger.info(json.dumps(log_data, default=str))
-        else:
-            self.logger.debug(json.dumps(log_data, default=str))
+        self.logger.log(level, orjson.dumps(log_data, default=str).decode())
+    
+    def is_enabled_for(self, level: int) -> bool:
+        """Check whether messages of the given level would be emitted."""
+        return self.logger.isEnabledFor(level)
     
     def info(self, message: str, **kwargs):
         """Log info message with context."""
@@ -77,6 +78,9 @@ class RequestResponseLogger:
         """
         Log incoming API request.
         """
+        # Copying the headers is the expensive part, so check the level before building kwargs
+        if not self.logger.is_enabled_for(logging.INFO):
+            return
         self.logger.info(
             "API Request",
             method=method,
@@ -91,6 +95,8 @@ class RequestResponseLogger:
         """
         Log API response.
         """
+        if not self.logger.is_enabled_for(logging.INFO):
+            return
         self.logger.info(
             "API Response",
             method=method,
@@ -159,6 +165,10 @@ class ServiceLogger:
             **kwargs
         )
     
+    def is_enabled_for(self, level: int) -> bool:
+        """Check whether messages of the given level would be emitted."""
+        return self.logger.is_enabled_for(level)
+    
     def info(self, message: str, **kwargs):
         """Log info message with context."""
         self.logger.info(message, **kwargs)
@@ -176,13 +186,15 @@ class ServiceLogger:
         self.logger.debug(message, **kwargs)
 
 
+@functools.lru_cache(maxsize=None)
 def get_logger(name: str) -> StructuredLogger:
     """
-    Get a structured logger instance.
+    Get a structured logger instance (one shared instance per name).
     """
     return StructuredLogger(name)
 
 
+@functools.lru_cache(maxsize=None)
 def get_request_logger() -> RequestResponseLogger:
     """
     Get request/response logger instance.
@@ -190,6 +202,7 @@ def get_request_logger() -> RequestResponseLogger:
     return RequestResponseLogger()
 
 
+@functools.lru_cache(maxsize=None)
 def get_service_logger(service_name: str) -> ServiceLogger:
     """
     Get service logger instance.
@@ -0,0 +1,138 @@
+"""
+Batched io_uring file writer for streamed media downloads.
+Uses the optional `liburing` package on Linux; callers fall back to aiofiles when unavailable.
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+try:
+    import liburing
+except ImportError:  # optional dependency
+    liburing = None
+
+# True when io_uring writes can be attempted on this host
+URING_AVAILABLE: bool = sys.platform == "linux" and liburing is not None
+
+
+class UringWriter:
+    """
+    Sequential file writer that queues chunk writes as io_uring SQEs and
+    submits them in batches, waiting for all completions with one submit call.
+
+    Usage:
+        writer = UringWriter(path)
+        writer.open()
+        try:
+            for chunk in chunks:
+                await writer.write(chunk)
+            await writer.flush()
+        finally:
+            writer.close()
+    """
+
+    def __init__(self, path: Path, batch_size: int = 8):
+        """
+        Args:
+            path: Destination file path (created or truncated)
+            batch_size: Number of queued writes that triggers a submission
+        """
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._ring = None
+        self._fd = -1
+        self._offset = 0
+        # Buffers must stay referenced until their completions are reaped
+        self._pending: List[Tuple[bytes, int]] = []
+
+    def open(self) -> None:
+        """
+        Open the destination file and set up the ring.
+
+        Raises:
+            OSError: If io_uring is unavailable (missing package, old kernel, seccomp)
+                or the installed binding does not work on this host
+        """
+        if not URING_AVAILABLE:
+            raise OSError("io_uring is not available on this host")
+
+        try:
+            ring = liburing.io_uring()
+            liburing.io_uring_queue_init(self.batch_size, ring, 0)
+        except OSError:
+            raise
+        except Exception as e:
+            # An incompatible binding fails with AttributeError/TypeError; callers only handle OSError
+            raise OSError(f"io_uring setup failed: {e}") from e
+        self._ring = ring
+        try:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        except OSError:
+            self.close()
+            raise
+
+    async def write(self, chunk: bytes) -> None:
+        """
+        Queue a chunk at the current file offset, submitting once a batch is full.
+
+        Args:
+            chunk: Bytes to append to the file
+        """
+        sqe = liburing.io_uring_get_sqe(self._ring)
+        liburing.io_uring_prep_write(sqe, self._fd, chunk, len(chunk), self._offset)
+        self._pending.append((chunk, self._offset))
+        self._offset += len(chunk)
+
+        if len(self._pending) >= self.batch_size:
+            await asyncio.to_thread(self._submit_and_wait)
+
+    async def flush(self) -> None:
+        """
+        Submit any queued writes and wait for them to complete.
+        """
+        if self._pending:
+            await asyncio.to_thread(self._submit_and_wait)
+
+    def _submit_and_wait(self) -> None:
+        """
+        Submit queued SQEs and reap one completion per queued write.
+        Short writes are completed with a plain pwrite.
+
+        Raises:
+            OSError: If any write fails
+        """
+        pending, self._pending = self._pending, []
+        liburing.io_uring_submit(self._ring)
+
+        cqe = liburing.io_uring_cqe()
+        results = []
+        for _ in pending:
+            liburing.io_uring_wait_cqe(self._ring, cqe)
+            results.append(cqe.res)
+            liburing.io_uring_cqe_seen(self._ring, cqe)
+
+        # Completions can arrive in any order, so the batch is checked as a whole
+        for res in results:
+            if res < 0:
+                raise OSError(-res, os.strerror(-res), str(self.path))
+
+        written = sum(results)
+        expected = sum(len(chunk) for chunk, _ in pending)
+        if written != expected:
+            # Rare short write: rewrite the batch synchronously to guarantee contents
+            for chunk, offset in pending:
+                os.pwrite(self._fd, chunk, offset)
+
+    def close(self) -> None:
+        """
+        Close the file descriptor and tear down the ring.
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        if self._ring is not None:
+            liburing.io_uring_queue_exit(self._ring)
+            self._ring = None
@@ -3,27 +3,183 @@ URL validation utilities for Instagram and TikTok links.
 Validates that URLs are legitimate social media post/reel links.
 """
 
-import re
-from typing import Tuple, Optional
+from functools import lru_cache
+from typing import Tuple, Optional, Literal, List
 from urllib.parse import urlparse
 import logging
+import threading
+
+try:
+    # RE2 matches in linear time regardless of input; optional dependency
+    import re2 as _regex
+except ImportError:
+    import re as _regex
+
+try:
+    # Hyperscan scans all patterns in a single DFA pass; optional dependency
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 logger = logging.getLogger(__name__)
 
-# Instagram URL patterns
-INSTAGRAM_PATTERNS = [
-    r'https?://(?:www\.)?instagram\.com/p/[A-Za-z0-9_-]+/?',
-    r'https?://(?:www\.)?instagram\.com/reel/[A-Za-z0-9_-]+/?',
-    r'https?://(?:www\.)?instagram\.com/tv/[A-Za-z0-9_-]+/?',
-]
+# Instagram URL patterns (sources kept for debugging; matching uses the compiled forms).
+# Patterns run against URLs whose scheme and host are already lowercase, so only the
+# route tokens need case-insensitivity; shortcodes list both cases explicitly. Only syntax
+# shared by `re` and RE2 is used, with ASCII-only classes so both engines agree.
+_INSTAGRAM_PATTERN_SOURCES = (
+    r'https?://(?:www\.)?instagram\.com/(?i:p)/[A-Za-z0-9_-]+/?',
+    r'https?://(?:www\.)?instagram\.com/(?i:reel)/[A-Za-z0-9_-]+/?',
+    r'https?://(?:www\.)?instagram\.com/(?i:tv)/[A-Za-z0-9_-]+/?',
+)
 
 # TikTok URL patterns
-TIKTOK_PATTERNS = [
-    r'https?://(?:www\.)?tiktok\.com/@[A-Za-z0-9_.-]+/video/\d+/?',
+_TIKTOK_PATTERN_SOURCES = (
+    r'https?://(?:www\.)?tiktok\.com/@[A-Za-z0-9_.-]+/(?i:video)/[0-9]+/?',
     r'https?://(?:www\.)?vm\.tiktok\.com/[A-Za-z0-9]+/?',
     r'https?://(?:www\.)?vt\.tiktok\.com/[A-Za-z0-9]+/?',
-    r'https?://(?:www\.)?m\.tiktok\.com/v/\d+/?',
-]
+    r'https?://(?:www\.)?m\.tiktok\.com/(?i:v)/[0-9]+/?',
+)
+
+# All patterns fused into one alternation; the named group that matched identifies the platform
+_COMBINED = _regex.compile(
+    '(?P<instagram>' + '|'.join(_INSTAGRAM_PATTERN_SOURCES) + ')'
+    '|(?P<tiktok>' + '|'.join(_TIKTOK_PATTERN_SOURCES) + ')'
+)
+
+Platform = Literal['instagram', 'tiktok']
+
+def _compile_hyperscan_database():
+    """
+    Compile all patterns into one Hyperscan block-mode database.
+    
+    Pattern ids follow the source tuples, Instagram first. Patterns are anchored
+    with '^' to keep re.match()'s prefix semantics.
+    
+    Returns:
+        The database, or None if Hyperscan is unavailable or rejects the patterns
+    """
+    if hyperscan is None:
+        return None
+    sources = _INSTAGRAM_PATTERN_SOURCES + _TIKTOK_PATTERN_SOURCES
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[('^' + source).encode() for source in sources],
+            ids=list(range(len(sources))),
+            elements=len(sources),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(sources),
+        )
+    except hyperscan.error as e:
+        logger.warning("Hyperscan unavailable for URL matching, using regex: %s", e)
+        return None
+    return db
+
+_HS_DATABASE = _compile_hyperscan_database()
+
+# Hyperscan scratch space must not be shared between concurrent scans
+_hs_local = threading.local()
+
+def _on_hs_match(pattern_id: int, start: int, end: int, flags: int, matches: List[int]) -> None:
+    matches.append(pattern_id)
+
+def _match_patterns(normalized: str) -> Optional[Platform]:
+    """
+    Run the full URL patterns against a normalized URL.
+    
+    Args:
+        normalized: URL with lowercase scheme and host
+        
+    Returns:
+        The platform of the matching pattern, or None
+    """
+    if _HS_DATABASE is None:
+        m = _COMBINED.match(normalized)
+        return m.lastgroup if m else None
+    
+    scratch = getattr(_hs_local, 'scratch', None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(_HS_DATABASE)
+    matches: List[int] = []
+    _HS_DATABASE.scan(normalized.encode(), match_event_handler=_on_hs_match, context=matches, scratch=scratch)
+    if not matches:
+        return None
+    return 'instagram' if matches[0] < len(_INSTAGRAM_PATTERN_SOURCES) else 'tiktok'
+
+# Every host the patterns above can match (lowercase)
+_ALLOWED_HOSTS = frozenset({
+    'instagram.com', 'www.instagram.com',
+    'tiktok.com', 'www.tiktok.com',
+    'vm.tiktok.com', 'www.vm.tiktok.com',
+    'vt.tiktok.com', 'www.vt.tiktok.com',
+    'm.tiktok.com', 'www.m.tiktok.com',
+})
+
+_UNSUPPORTED_MESSAGE = "URL must be a valid Instagram post/reel or TikTok video link"
+_UNSUPPORTED: Tuple[bool, Optional[str], Optional[str]] = (False, None, _UNSUPPORTED_MESSAGE)
+
+# Longer URLs are validated without being memoized, so oversized input can't crowd out the cache
+_MAX_CACHED_URL_LENGTH = 2048
+
+def _prefixes(hosts: Tuple[str, ...], route: str) -> Tuple[str, ...]:
+    """Expand hosts into every normalized 'scheme://host/route' prefix."""
+    return tuple(f'{scheme}://{host}/{route}' for scheme in ('http', 'https') for host in hosts)
+
+# Normalized (lowercase scheme and host) prefixes of the common URL shapes;
+# str.startswith() checks a whole tuple in one call
+_INSTAGRAM_PREFIXES = tuple(
+    prefix for route in ('p/', 'reel/', 'tv/')
+    for prefix in _prefixes(('instagram.com', 'www.instagram.com'), route)
+)
+_TIKTOK_WEB_PREFIXES = _prefixes(('tiktok.com', 'www.tiktok.com'), '@')
+_TIKTOK_SHORT_PREFIXES = _prefixes(('vm.tiktok.com', 'www.vm.tiktok.com', 'vt.tiktok.com', 'www.vt.tiktok.com'), '')
+_TIKTOK_MOBILE_PREFIXES = _prefixes(('m.tiktok.com', 'www.m.tiktok.com'), 'v/')
+
+def _is_token(segment: str, extra: str = '') -> bool:
+    """Check that a path segment is non-empty ASCII alphanumerics plus the given punctuation."""
+    if not segment or not segment.isascii():
+        return False
+    for ch in extra:
+        segment = segment.replace(ch, '')
+    return not segment or segment.isalnum()
+
+def _is_ascii_number(segment: str) -> bool:
+    """Check that a path segment is a non-empty run of ASCII digits."""
+    return segment.isascii() and segment.isdigit()
+
+def _match_common_shape(normalized: str) -> Optional[Platform]:
+    """
+    Recognize the common URL shapes by prefix, checking only the ID segments.
+    
+    Only answers when the combined regex is guaranteed to match too; anything
+    unusual (e.g. mixed-case routes) returns None and goes through the regex.
+    
+    Args:
+        normalized: URL with lowercase scheme and a host from _ALLOWED_HOSTS
+        
+    Returns:
+        The platform, or None if the regex has to decide
+    """
+    # ['https:', '', host, segment, segment, segment, rest]
+    if normalized.startswith(_INSTAGRAM_PREFIXES):
+        # /p/<shortcode>, /reel/<shortcode>, /tv/<shortcode>
+        if _is_token(normalized.split('/', 5)[4], '_-'):
+            return 'instagram'
+    elif normalized.startswith(_TIKTOK_WEB_PREFIXES):
+        # /@<user>/video/<id>
+        parts = normalized.split('/', 6)
+        if (len(parts) >= 6 and _is_token(parts[3][1:], '_.-')
+                and parts[4] == 'video' and _is_ascii_number(parts[5])):
+            return 'tiktok'
+    elif normalized.startswith(_TIKTOK_MOBILE_PREFIXES):
+        # /v/<id>
+        if _is_ascii_number(normalized.split('/', 5)[4]):
+            return 'tiktok'
+    elif normalized.startswith(_TIKTOK_SHORT_PREFIXES):
+        # /<code>
+        if _is_token(normalized.split('/', 4)[3]):
+            return 'tiktok'
+    return None
 
 def validate_url(url: str) -> Tuple[bool, Optional[str], Optional[str]]:
     """
@@ -41,38 +197,98 @@ def validate_url(url: str) -> Tuple[bool, Optional[str], Optional[str]]:
     if not url or not isinstance(url, str):
         return False, None, "URL is required and must be a string"
     
-    # Clean and normalize URL
+    # Clean and normalize URL (also normalizes the cache key)
     url = url.strip()
     if not url:
         return False, None, "URL cannot be empty"
     
+    if len(url) <= _MAX_CACHED_URL_LENGTH:
+        result = _validate_url_cached(url)
+    else:
+        result = _check_url(url)
+    
+    # Logged here rather than in the memoized check, so repeated URLs are logged every time
+    is_valid, platform, _ = result
+    if is_valid:
+        # Valid URLs are the normal case; only worth a record when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Valid %s URL detected: %s", 'Instagram' if platform == 'instagram' else 'TikTok', url)
+    elif result is _UNSUPPORTED and logger.isEnabledFor(logging.WARNING):
+        logger.warning("Unsupported URL format: %s", url[:_MAX_CACHED_URL_LENGTH])
+    return result
+
+@lru_cache(maxsize=4096)
+def _validate_url_cached(url: str) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Memoized _check_url for URLs up to _MAX_CACHED_URL_LENGTH characters."""
+    return _check_url(url)
+
+def _check_url(url: str) -> Tuple[bool, Optional[str], Optional[str]]:
+    """
+    Validate a stripped, non-empty URL string without logging.
+    
+    Args:
+        url: URL to validate
+        
+    Returns:
+        Tuple of (is_valid, platform, error_message); unsupported links return _UNSUPPORTED
+    """
     # Check if URL starts with http/https
     if not url.startswith(('http://', 'https://')):
         return False, None, "URL must start with http:// or https://"
     
-    # Parse URL to check basic structure
-    try:
-        parsed = urlparse(url)
-        if not parsed.netloc:
-            return False, None, "Invalid URL format"
-    except Exception as e:
-        return False, None, f"Invalid URL format: {str(e)}"
-    
-    # Check Instagram patterns
-    for pattern in INSTAGRAM_PATTERNS:
-        if re.match(pattern, url, re.IGNORECASE):
-            logger.info("Valid Instagram URL detected: %s", url)
-            return True, 'instagram', None
-    
-    # Check TikTok patterns
-    for pattern in TIKTOK_PATTERNS:
-        if re.match(pattern, url, re.IGNORECASE):
-            logger.info("Valid TikTok URL detected: %s", url)
-            return True, 'tiktok', None
+    # Extract the host by slicing; like urlparse, the netloc ends at the first '/', '?' or '#'
+    start = url.find('://') + 3
+    host_end = len(url)
+    for sep in '/?#':
+        i = url.find(sep, start, host_end)
+        if i != -1:
+            host_end = i
+    host = url[start:host_end]
+    if not host:
+        return False, None, "Invalid URL format"
+    
+    if not host.isascii() or '[' in host or ']' in host:
+        # Exotic netlocs (IPv6 brackets, non-ASCII) keep urlparse's error reporting,
+        # but can never be one of the supported ASCII hosts
+        try:
+            urlparse(url)
+        except Exception as e:
+            return False, None, f"Invalid URL format: {str(e)}"
+        return _UNSUPPORTED
+    
+    # Fast reject: the patterns only ever match these exact hosts
+    host = host.lower()
+    if host not in _ALLOWED_HOSTS:
+        return _UNSUPPORTED
+    
+    # The scheme is already lowercase (startswith above is case-sensitive), so only
+    # the host is normalized
+    normalized = url[:start] + host + url[host_end:]
+    
+    # Common shapes are recognized without the regex; the rest falls through to it
+    platform = _match_common_shape(normalized)
+    if platform is None:
+        # Check Instagram and TikTok patterns in a single pass
+        platform = _match_patterns(normalized)
+    
+    if platform:
+        return True, platform, None
     
     # If no patterns matched, it's not a supported URL
-    logger.warning("Unsupported URL format: %s", url)
-    return False, None, "URL must be a valid Instagram post/reel or TikTok video link"
+    return _UNSUPPORTED
+
+def classify_url(url: str) -> Optional[Platform]:
+    """
+    Classify a URL by platform with a single validation pass.
+    
+    Args:
+        url: URL to classify
+        
+    Returns:
+        'instagram' or 'tiktok' if the URL is a supported link, None otherwise
+    """
+    _, platform, _ = validate_url(url)
+    return platform
 
 def get_platform_from_url(url: str) -> Optional[str]:
     """
@@ -84,8 +300,7 @@ def get_platform_from_url(url: str) -> Optional[str]:
     Returns:
         Platform name ('instagram' or 'tiktok') or None if not supported
     """
-    is_valid, platform, _ = validate_url(url)
-    return platform if is_valid else None
+    return classify_url(url)
 
 def is_instagram_url(url: str) -> bool:
     """
@@ -97,8 +312,7 @@ def is_instagram_url(url: str) -> bool:
     Returns:
         True if URL is Instagram, False otherwise
     """
-    is_valid, platform, _ = validate_url(url)
-    return is_valid and platform == 'instagram'
+    return classify_url(url) == 'instagram'
 
 def is_tiktok_url(url: str) -> bool:
     """
@@ -110,8 +324,7 @@ def is_tiktok_url(url: str) -> bool:
     Returns:
         True if URL is TikTok, False otherwise
     """
-    is_valid, platform, _ = validate_url(url)
-    return is_valid and platform == 'tiktok'
+    return classify_url(url) == 'tiktok'
 
 def validate_and_get_platform(url: str) -> Tuple[bool, Optional[str], Optional[str]]:
     """
@@ -7,10 +7,12 @@ Measures and tracks performance metrics for audio extraction operations.
 import time
 import os
 import sys
-import json
+import statistics
+import tempfile
+import orjson
 import psutil
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import asyncio
 
 # Add the app directory to the Python path
@@ -22,22 +24,56 @@ from app.services.ffmpeg_utils import extract_audio_from_video, extract_audio_wi
 class AudioExtractionBenchmark:
     """Benchmarking framework for audio extraction performance."""
     
-    def __init__(self, output_dir: str = "benchmark_results"):
+    def __init__(self, output_dir: str = "benchmark_results", keep_raw: bool = False):
         self.output_dir = Path(output_dir)
+        # Per-iteration measurements are only kept in the results when explicitly requested
+        self.keep_raw = keep_raw
         self.output_dir.mkdir(exist_ok=True)
         self.results = []
         
     def get_system_info(self) -> Dict[str, Any]:
         """Get system information for benchmarking context."""
+        memory = psutil.virtual_memory()
         return {
             "cpu_count": psutil.cpu_count(),
-            "memory_total": psutil.virtual_memory().total,
-            "memory_available": psutil.virtual_memory().available,
+            "memory_total": memory.total,
+            "memory_available": memory.available,
             "disk_usage": psutil.disk_usage('/').percent,
             "python_version": sys.version,
             "platform": sys.platform
         }
     
+    @staticmethod
+    def _scratch_dir(audio_path: str) -> tempfile.TemporaryDirectory:
+        """
+        Create a scratch directory for one measurement run's output files.
+        It lives next to the requested audio path so writes hit the same filesystem.
+        """
+        parent = os.path.dirname(os.path.abspath(audio_path))
+        os.makedirs(parent, exist_ok=True)
+        return tempfile.TemporaryDirectory(prefix="benchmark_", dir=parent)
+    
+    def _summarize(self, times: List[Any], memory_usage: List[Any], cpu_usage: List[Any]) -> Dict[str, Any]:
+        """Calculate summary statistics from per-iteration measurements (None marks a failed run)."""
+        valid_times = [t for t in times if t is not None]
+        valid_memory = [m for m in memory_usage if m is not None]
+        valid_cpu = [c for c in cpu_usage if c is not None]
+        
+        summary = {
+            "successful_extractions": len(valid_times),
+            "failed_extractions": len(times) - len(valid_times),
+            "avg_time": statistics.fmean(valid_times) if valid_times else None,
+            "min_time": min(valid_times) if valid_times else None,
+            "max_time": max(valid_times) if valid_times else None,
+            "avg_memory_usage": statistics.fmean(valid_memory) if valid_memory else None,
+            "max_memory_usage": max(valid_memory) if valid_memory else None,
+            "avg_cpu_usage": statistics.fmean(valid_cpu) if valid_cpu else None,
+            "max_cpu_usage": max(valid_cpu) if valid_cpu else None,
+        }
+        if self.keep_raw:
+            summary.update(raw_times=times, raw_memory=memory_usage, raw_cpu=cpu_usage)
+        return summary
+    
     def measure_extraction_time(self, video_path: str, audio_path: str, iterations: int = 3) -> Dict[str, Any]:
         """Measure audio extraction time and performance metrics."""
         print(f"🎬 Benchmarking audio extraction for {os.path.basename(video_path)}")
@@ -45,174 +81,103 @@ class AudioExtractionBenchmark:
         times = []
         memory_usage = []
         cpu_usage = []
+        stem = Path(audio_path).stem
         
-        for i in range(iterations):
-            print(f"  Iteration {i+1}/{iterations}...")
-            
-            # Clean up previous test file
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-            
-            # Measure system resources before extraction
-            process = psutil.Process()
-            memory_before = process.memory_info().rss
-            cpu_before = process.cpu_percent()
-            
-            # Measure extraction time
-            start_time = time.time()
-            success, error = extract_audio_from_video(video_path, audio_path)
-            end_time = time.time()
-            
-            # Measure system resources after extraction
-            memory_after = process.memory_info().rss
-            cpu_after = process.cpu_percent()
-            
-            if success:
-                extraction_time = end_time - start_time
-                times.append(extraction_time)
-                memory_usage.append(memory_after - memory_before)
-                cpu_usage.append(cpu_after - cpu_before)
-                
-                print(f"    ✅ Success: {extraction_time:.2f}s")
-            else:
-                print(f"    ❌ Failed: {error}")
-                times.append(None)
-                memory_usage.append(None)
-                cpu_usage.append(None)
-            
-            # Clean up test file
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-        
-        # Calculate statistics
-        valid_times = [t for t in times if t is not None]
-        valid_memory = [m for m in memory_usage if m is not None]
-        valid_cpu = [c for c in cpu_usage if c is not None]
-        
-        if valid_times:
-            avg_time = sum(valid_times) / len(valid_times)
-            min_time = min(valid_times)
-            max_time = max(valid_times)
-        else:
-            avg_time = min_time = max_time = None
+        # One process handle for the whole run; the first cpu_percent() call only primes
+        # the counter (it always returns 0.0), later calls report usage since the previous one
+        process = psutil.Process()
+        process.cpu_percent(None)
         
-        if valid_memory:
-            avg_memory = sum(valid_memory) / len(valid_memory)
-            max_memory = max(valid_memory)
-        else:
-            avg_memory = max_memory = None
-        
-        if valid_cpu:
-            avg_cpu = sum(valid_cpu) / len(valid_cpu)
-            max_cpu = max(valid_cpu)
-        else:
-            avg_cpu = max_cpu = None
+        # Every iteration writes a fresh file into one scratch directory, removed in one go at the end
+        with self._scratch_dir(audio_path) as scratch:
+            for i in range(iterations):
+                print(f"  Iteration {i+1}/{iterations}...")
+                output_path = os.path.join(scratch, f"{stem}_{i}.mp3")
+                
+                memory_before = process.memory_info().rss
+                process.cpu_percent(None)
+                
+                # Measure extraction time (monotonic; immune to wall-clock adjustments)
+                start_time = time.perf_counter_ns()
+                success, error = extract_audio_from_video(video_path, output_path)
+                end_time = time.perf_counter_ns()
+                
+                # CPU usage over the extraction interval
+                cpu_during = process.cpu_percent(None)
+                memory_after = process.memory_info().rss
+                
+                if success:
+                    extraction_time = (end_time - start_time) / 1e9
+                    times.append(extraction_time)
+                    memory_usage.append(memory_after - memory_before)
+                    cpu_usage.append(cpu_during)
+                    
+                    print(f"    ✅ Success: {extraction_time:.2f}s")
+                else:
+                    print(f"    ❌ Failed: {error}")
+                    times.append(None)
+                    memory_usage.append(None)
+                    cpu_usage.append(None)
         
         return {
             "video_file": os.path.basename(video_path),
             "video_size": os.path.getsize(video_path),
             "iterations": iterations,
-            "successful_extractions": len(valid_times),
-            "failed_extractions": iterations - len(valid_times),
-            "avg_time": avg_time,
-            "min_time": min_time,
-            "max_time": max_time,
-            "avg_memory_usage": avg_memory,
-            "max_memory_usage": max_memory,
-            "avg_cpu_usage": avg_cpu,
-            "max_cpu_usage": max_cpu,
-            "raw_times": times,
-            "raw_memory": memory_usage,
-            "raw_cpu": cpu_usage
+            **self._summarize(times, memory_usage, cpu_usage)
         }
     
     async def measure_async_extraction_time(self, video_path: str, audio_path: str, timeout: int = 30, iterations: int = 3) -> Dict[str, Any]:
-        """Measure async audio extraction time and performance metrics."""
+        """Measure async audio extraction time and performance metrics, running iterations concurrently."""
         print(f"🚀 Benchmarking async audio extraction for {os.path.basename(video_path)}")
         
-        times = []
-        memory_usage = []
-        cpu_usage = []
+        stem = Path(audio_path).stem
+        # ffmpeg is CPU bound, so run at most one extraction per core
+        concurrency = max(1, min(iterations, psutil.cpu_count() or 1))
+        sem = asyncio.Semaphore(concurrency)
         
-        for i in range(iterations):
-            print(f"  Async iteration {i+1}/{iterations}...")
-            
-            # Clean up previous test file
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-            
-            # Measure system resources before extraction
+        async def _one_iter(i: int, scratch: str) -> Tuple[Optional[float], Optional[int], Optional[float], Optional[str]]:
+            # Each iteration writes its own file, so concurrent iterations never collide
+            output_path = os.path.join(scratch, f"{stem}_{i}.mp3")
+            # cpu_percent() keeps its baseline per handle, so overlapping iterations need their own
             process = psutil.Process()
-            memory_before = process.memory_info().rss
-            cpu_before = process.cpu_percent()
             
-            # Measure async extraction time
-            start_time = time.time()
-            success, error = await extract_audio_with_timeout(video_path, audio_path, timeout)
-            end_time = time.time()
-            
-            # Measure system resources after extraction
-            memory_after = process.memory_info().rss
-            cpu_after = process.cpu_percent()
-            
-            if success:
-                extraction_time = end_time - start_time
-                times.append(extraction_time)
-                memory_usage.append(memory_after - memory_before)
-                cpu_usage.append(cpu_after - cpu_before)
+            async with sem:
+                print(f"  Async iteration {i+1}/{iterations}...")
+                memory_before = process.memory_info().rss
+                process.cpu_percent(None)
+                
+                # Measure async extraction time
+                start_time = time.perf_counter_ns()
+                success, error = await extract_audio_with_timeout(video_path, output_path, timeout)
+                end_time = time.perf_counter_ns()
                 
-                print(f"    ✅ Success: {extraction_time:.2f}s")
-            else:
+                # CPU usage over the extraction interval
+                cpu_during = process.cpu_percent(None)
+                memory_after = process.memory_info().rss
+            
+            if not success:
                 print(f"    ❌ Failed: {error}")
-                times.append(None)
-                memory_usage.append(None)
-                cpu_usage.append(None)
+                return None, None, None, error
             
-            # Clean up test file
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-        
-        # Calculate statistics (same as sync version)
-        valid_times = [t for t in times if t is not None]
-        valid_memory = [m for m in memory_usage if m is not None]
-        valid_cpu = [c for c in cpu_usage if c is not None]
+            extraction_time = (end_time - start_time) / 1e9
+            print(f"    ✅ Success: {extraction_time:.2f}s")
+            return extraction_time, memory_after - memory_before, cpu_during, None
         
-        if valid_times:
-            avg_time = sum(valid_times) / len(valid_times)
-            min_time = min(valid_times)
-            max_time = max(valid_times)
-        else:
-            avg_time = min_time = max_time = None
+        with self._scratch_dir(audio_path) as scratch:
+            start_time = time.perf_counter_ns()
+            results = await asyncio.gather(*(_one_iter(i, scratch) for i in range(iterations)))
+            wall_time = (time.perf_counter_ns() - start_time) / 1e9
         
-        if valid_memory:
-            avg_memory = sum(valid_memory) / len(valid_memory)
-            max_memory = max(valid_memory)
-        else:
-            avg_memory = max_memory = None
-        
-        if valid_cpu:
-            avg_cpu = sum(valid_cpu) / len(valid_cpu)
-            max_cpu = max(valid_cpu)
-        else:
-            avg_cpu = max_cpu = None
+        times, memory_usage, cpu_usage, _ = (list(column) for column in zip(*results)) if results else ([], [], [], [])
         
         return {
             "video_file": os.path.basename(video_path),
             "video_size": os.path.getsize(video_path),
             "timeout": timeout,
             "iterations": iterations,
-            "successful_extractions": len(valid_times),
-            "failed_extractions": iterations - len(valid_times),
-            "avg_time": avg_time,
-            "min_time": min_time,
-            "max_time": max_time,
-            "avg_memory_usage": avg_memory,
-            "max_memory_usage": max_memory,
-            "avg_cpu_usage": avg_cpu,
-            "max_cpu_usage": max_cpu,
-            "raw_times": times,
-            "raw_memory": memory_usage,
-            "raw_cpu": cpu_usage
+            "concurrency": concurrency,
+            "wall_time": wall_time,
+            **self._summarize(times, memory_usage, cpu_usage)
         }
     
     def run_comprehensive_benchmark(self, video_files: List[str], iterations: int = 3) -> Dict[str, Any]:
@@ -281,8 +246,7 @@ class AudioExtractionBenchmark:
         filename = f"audio_extraction_benchmark_{timestamp}.json"
         filepath = self.output_dir / filename
         
-        with open(filepath, 'w') as f:
-            json.dump(results, f, indent=2)
+        filepath.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
         
         print(f"📊 Benchmark results saved to: {filepath}")
     
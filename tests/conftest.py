@@ -0,0 +1,30 @@
+"""
+Shared pytest fixtures for the Instagram Downloader API tests.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import create_app
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Create the test application once for the whole test session."""
+    app = create_app()
+    # Build the OpenAPI schema up front; FastAPI keeps it in app.openapi_schema,
+    # so /openapi.json and /docs never regenerate it during the session
+    app.openapi()
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """
+    Create a test client shared by all tests.
+    
+    The client is not entered as a context manager, so the app lifespan (service
+    initialization, background cleanup, shutdown) does not run; the endpoints under
+    test don't need it, and shutdown cancels every remaining task, including the
+    client's own portal.
+    """
+    return TestClient(app)
@@ -0,0 +1,141 @@
+"""
+Unit tests for DirectWriter. O_DIRECT itself is disabled (most test filesystems
+reject it), and os.pwrite is wrapped to simulate how O_DIRECT writes can fail.
+"""
+
+import asyncio
+import errno
+import os
+
+import pytest
+
+from app.utils import direct_writer
+from app.utils.direct_writer import DirectWriter
+
+BLOCK = DirectWriter.BLOCK_SIZE
+
+
+@pytest.fixture(autouse=True)
+def plain_open(monkeypatch):
+    """Open the "direct" descriptor without O_DIRECT so tests run on any filesystem."""
+    monkeypatch.setattr(direct_writer, "O_DIRECT", 0)
+    monkeypatch.setattr(direct_writer, "DIRECT_IO_AVAILABLE", True)
+
+
+@pytest.fixture
+def direct_pwrites(monkeypatch):
+    """
+    Record pwrite calls on the writer's direct descriptor and let tests change
+    their outcome through the returned hook.
+    """
+    calls = []
+    state = {"writer": None, "hook": None}
+    real_pwrite = os.pwrite
+
+    def pwrite(fd, data, offset):
+        # Descriptor numbers are reused, so compare against the writer's live O_DIRECT descriptor
+        writer = state["writer"]
+        if writer is None or fd != writer._fd:
+            return real_pwrite(fd, data, offset)
+        calls.append((len(data), offset))
+        if state["hook"] is not None:
+            return state["hook"](fd, data, offset, real_pwrite)
+        return real_pwrite(fd, data, offset)
+
+    monkeypatch.setattr(direct_writer.os, "pwrite", pwrite)
+    return calls, state
+
+
+def write_all(path, chunks, state=None, buffer_size=2 * BLOCK):
+    """Write chunks through a DirectWriter."""
+    async def run():
+        writer = DirectWriter(path, buffer_size=buffer_size)
+        writer.open()
+        if state is not None:
+            state["writer"] = writer
+        try:
+            for chunk in chunks:
+                await writer.write(chunk)
+            await writer.flush()
+        finally:
+            writer.close()
+
+    asyncio.run(run())
+
+
+def payload(size):
+    return bytes(i % 251 for i in range(size))
+
+
+def test_full_buffers_and_tail(tmp_path, direct_pwrites):
+    """Test full buffers go through the direct descriptor and the partial final block is flushed."""
+    calls, state = direct_pwrites
+    path = tmp_path / "video.mp4"
+    data = payload(5 * BLOCK + 123)
+
+    write_all(path, [data[:3000], data[3000:]], state)
+
+    assert path.read_bytes() == data
+    assert calls == [(2 * BLOCK, 0), (2 * BLOCK, 2 * BLOCK), (BLOCK, 4 * BLOCK)]
+
+
+def test_tail_only(tmp_path):
+    """Test a file smaller than one block is written entirely on flush."""
+    path = tmp_path / "video.mp4"
+
+    write_all(path, [b"short"])
+
+    assert path.read_bytes() == b"short"
+
+
+def test_einval_on_first_write_falls_back(tmp_path, direct_pwrites):
+    """Test a filesystem rejecting O_DIRECT writes switches the download to buffered writes."""
+    calls, state = direct_pwrites
+
+    def reject(fd, data, offset, real_pwrite):
+        raise OSError(errno.EINVAL, os.strerror(errno.EINVAL))
+
+    state["hook"] = reject
+    path = tmp_path / "video.mp4"
+    data = payload(5 * BLOCK + 7)
+
+    write_all(path, [data], state)
+
+    assert path.read_bytes() == data
+    assert calls == [(2 * BLOCK, 0)]
+
+
+def test_einval_after_first_write_raises(tmp_path, direct_pwrites):
+    """Test EINVAL once O_DIRECT writes have succeeded is reported, not masked."""
+    calls, state = direct_pwrites
+
+    def reject_later(fd, data, offset, real_pwrite):
+        if offset:
+            raise OSError(errno.EINVAL, os.strerror(errno.EINVAL))
+        return real_pwrite(fd, data, offset)
+
+    state["hook"] = reject_later
+
+    with pytest.raises(OSError):
+        write_all(tmp_path / "video.mp4", [payload(5 * BLOCK)], state)
+
+
+def test_short_write_redone_from_aligned_offset(tmp_path, direct_pwrites):
+    """Test a short unaligned write is rounded down and the rest rewritten on the buffered descriptor."""
+    calls, state = direct_pwrites
+
+    def short_once(fd, data, offset, real_pwrite):
+        if len(calls) == 1:
+            return real_pwrite(fd, bytes(data[:BLOCK + 100]), offset)
+        return real_pwrite(fd, data, offset)
+
+    state["hook"] = short_once
+    path = tmp_path / "video.mp4"
+    data = payload(4 * BLOCK + 50)
+
+    write_all(path, [data], state)
+
+    assert path.read_bytes() == data
+    # Every direct write stays aligned; the remainder of the short one is never retried there
+    assert calls == [(2 * BLOCK, 0), (2 * BLOCK, 2 * BLOCK)]
+    assert all(length % BLOCK == 0 and offset % BLOCK == 0 for length, offset in calls)
@@ -0,0 +1,51 @@
+"""
+Unit tests for the ffmpeg helpers: encoder arguments, and the async runner with a stand-in subprocess instead of ffmpeg.
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+from app.services import ffmpeg_utils
+
+
+def test_run_ffmpeg_async_kills_process_on_cancel(monkeypatch):
+    """Test cancelling the runner kills the subprocess instead of orphaning it."""
+    processes = []
+    create_subprocess_exec = asyncio.create_subprocess_exec
+
+    async def tracking_create_subprocess_exec(*args, **kwargs):
+        process = await create_subprocess_exec(*args, **kwargs)
+        processes.append(process)
+        return process
+
+    monkeypatch.setattr(
+        ffmpeg_utils.ffmpeg, "compile", lambda stream: [sys.executable, "-c", "import time; time.sleep(30)"]
+    )
+    monkeypatch.setattr(ffmpeg_utils.asyncio, "create_subprocess_exec", tracking_create_subprocess_exec)
+
+    async def run():
+        task = asyncio.create_task(ffmpeg_utils.run_ffmpeg_async(None))
+        while not processes:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(asyncio.wait_for(run(), timeout=10))
+
+    assert processes[0].returncode is not None
+
+
+@pytest.mark.parametrize("encoder", ["libx264", "h264_nvenc", "h264_qsv", "h264_videotoolbox"])
+def test_still_image_args_are_seekable(encoder):
+    """Test still-image encodes make every frame a keyframe; other encodes keep the default GOP."""
+    assert ffmpeg_utils.get_h264_encoder_args(encoder, still_image=True)["g"] == 1
+    assert "g" not in ffmpeg_utils.get_h264_encoder_args(encoder)
+
+
+def test_still_image_args_tune_libx264():
+    """Test libx264 still-image encodes use the stillimage tune."""
+    args = ffmpeg_utils.get_h264_encoder_args("libx264", crf=18, still_image=True)
+    assert args == {"vcodec": "libx264", "crf": 18, "preset": "medium", "tune": "stillimage", "g": 1}
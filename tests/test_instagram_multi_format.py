@@ -31,7 +31,7 @@ async def test_post_type_detection():
     
     for url in test_urls:
         try:
-            post_type = service.determine_post_type(url)
+            post_type, _ = await service.determine_post_type(url)
             print(f"✅ URL: {url}")
             print(f"   Post type: {post_type}")
         except Exception as e:
@@ -0,0 +1,175 @@
+"""
+Unit tests for InstagramService state shared across per-request instances.
+"""
+
+import asyncio
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from app.services.instagram_service import InstagramService
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Instagram service writing into a temporary media directory."""
+    return InstagramService(media_dir=str(tmp_path))
+
+
+def test_http_client_shared_and_closed(service, tmp_path):
+    """Test instances reuse one HTTP client and close() releases it."""
+    async def run():
+        client = service._get_http_client()
+        other = InstagramService(media_dir=str(tmp_path))
+        assert other._get_http_client() is client
+
+        await InstagramService.close()
+        return client
+
+    client = asyncio.run(run())
+
+    assert client.is_closed
+    assert InstagramService._http is None
+
+
+def test_post_cache_shared(service, tmp_path, monkeypatch):
+    """Test a post fetched by one instance is served from cache to the next."""
+    calls = []
+
+    async def fake_fetch_lite_post(client, shortcode, headers):
+        calls.append(shortcode)
+        return object()
+
+    monkeypatch.setattr("app.services.instagram_service.fetch_lite_post", fake_fetch_lite_post)
+    monkeypatch.setattr(InstagramService, "_post_cache", {})
+
+    async def run():
+        first = await service._fetch_post("ABC123")
+        second = await InstagramService(media_dir=str(tmp_path))._fetch_post("ABC123")
+        await InstagramService.close()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert calls == ["ABC123"]
+
+
+def stub_single_slide_carousel(service, image_path, monkeypatch):
+    """
+    Stub the network and ffmpeg steps of download_post for a carousel with one image.
+    
+    Returns:
+        List receiving the (width, height) of every image passed to the encoder
+    """
+    post = SimpleNamespace(mediaid=42, owner_username="user", caption="caption", date=datetime(2025, 1, 2))
+    Image.new("RGB", (101, 57), "white").save(image_path)
+    encoded = []
+
+    async def fake_determine_post_type(url):
+        return "carousel", post
+
+    async def fake_download_carousel_images(url, post=None):
+        return [image_path]
+
+    async def fake_create_static_image_video(path, duration=1, output_path=None):
+        with Image.open(path) as img:
+            encoded.append(img.size)
+        output_path.write_bytes(b"fake mp4 data")
+        return output_path
+
+    async def fake_create_silent_audio(video_path):
+        return None
+
+    async def fake_write_sidecar_files(post, unique_id, post_type):
+        pass
+
+    monkeypatch.setattr(service, "determine_post_type", fake_determine_post_type)
+    monkeypatch.setattr(service, "download_carousel_images", fake_download_carousel_images)
+    monkeypatch.setattr(service, "create_static_image_video", fake_create_static_image_video)
+    monkeypatch.setattr(service, "_create_silent_audio", fake_create_silent_audio)
+    monkeypatch.setattr(service, "_write_sidecar_files", fake_write_sidecar_files)
+    return encoded
+
+
+def test_single_slide_carousel_is_squared(service, tmp_path, monkeypatch):
+    """Test a carousel with one image encodes a padded square slide, not the raw image."""
+    image_path = tmp_path / "image_1.jpg"
+    encoded = stub_single_slide_carousel(service, image_path, monkeypatch)
+
+    filename, metadata = asyncio.run(service.download_post("https://www.instagram.com/p/ABC123/"))
+
+    assert encoded == [(InstagramService.SLIDE_SIZE, InstagramService.SLIDE_SIZE)]
+    assert filename.startswith("slideshow_")
+    assert metadata["audio_url"] is None
+    assert not image_path.exists()
+    assert not (tmp_path / "image_1_slide.jpg").exists()
+
+
+def test_large_file_writer_falls_back_on_broken_uring(service, tmp_path, monkeypatch):
+    """Test an unusable liburing binding falls back to aiofiles instead of failing the download."""
+    from app.config import AppConfig
+    from app.utils import uring_writer
+
+    monkeypatch.setattr(uring_writer, "liburing", SimpleNamespace())
+    monkeypatch.setattr(uring_writer, "URING_AVAILABLE", True)
+    monkeypatch.setattr("app.services.instagram_service.URING_AVAILABLE", True)
+    monkeypatch.setattr(AppConfig.VIDEO, "USE_ODIRECT", False)
+    monkeypatch.setattr(AppConfig.VIDEO, "USE_IO_URING", True)
+
+    assert service._open_large_file_writer(tmp_path / "video.mp4") is None
+
+
+def test_cleanup_runs_off_the_event_loop(service, tmp_path, monkeypatch):
+    """Test old-file cleanup after a download runs in a worker thread, not on the event loop."""
+    stub_single_slide_carousel(service, tmp_path / "image_1.jpg", monkeypatch)
+    cleanup_threads = []
+    monkeypatch.setattr(service, "_cleanup_old_files", lambda: cleanup_threads.append(threading.current_thread()))
+
+    async def run():
+        await service.download_post("https://www.instagram.com/p/ABC123/")
+        await InstagramService.wait_for_background_tasks(timeout=5.0)
+
+    asyncio.run(run())
+
+    assert len(cleanup_threads) == 1
+    assert cleanup_threads[0] is not threading.main_thread()
+
+
+def carousel_post(node_count):
+    """Carousel post stand-in with the given number of image nodes."""
+    nodes = [SimpleNamespace(is_video=False, display_url=f"https://cdn.example/{i}.jpg") for i in range(node_count)]
+    return SimpleNamespace(mediaid=42, get_sidecar_nodes=lambda: iter(nodes))
+
+
+def test_carousel_skips_failed_images(service, tmp_path, monkeypatch):
+    """Test a failed image download is skipped and the others are returned."""
+    async def fake_fetch_node(i, node, unique_id, semaphore):
+        if i == 1:
+            raise ValueError("404")
+        return tmp_path / f"{i}.jpg"
+
+    monkeypatch.setattr(service, "_fetch_node", fake_fetch_node)
+
+    paths = asyncio.run(service.download_carousel_images("https://www.instagram.com/p/ABC123/", post=carousel_post(3)))
+
+    assert paths == [tmp_path / "0.jpg", tmp_path / "2.jpg"]
+
+
+def test_carousel_propagates_cancellation(service, tmp_path, monkeypatch):
+    """Test a cancelled image download cancels the carousel instead of being returned as a path."""
+    async def fake_fetch_node(i, node, unique_id, semaphore):
+        if i == 1:
+            raise asyncio.CancelledError()
+        return tmp_path / f"{i}.jpg"
+
+    monkeypatch.setattr(service, "_fetch_node", fake_fetch_node)
+
+    async def run():
+        with pytest.raises(asyncio.CancelledError):
+            await service.download_carousel_images("https://www.instagram.com/p/ABC123/", post=carousel_post(3))
+
+    asyncio.run(run())
@@ -5,8 +5,7 @@ Tests all major functionality including audio extraction, error handling, and lo
 
 import pytest
 import asyncio
-import json
-from fastapi.testclient import TestClient
+import orjson
 from app.main import create_app
 
 
@@ -15,21 +14,11 @@ class TestIntegration:
     Integration tests for the complete application.
     """
     
-    @pytest.fixture
-    def app(self):
-        """Create test application."""
-        return create_app()
-    
-    @pytest.fixture
-    def client(self, app):
-        """Create test client."""
-        return TestClient(app)
-    
     def test_health_endpoint(self, client):
         """Test health check endpoint."""
         response = client.get("/")
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["status"] == "ok"
         assert data["service"] == "instagram-downloader"
     
@@ -37,27 +26,52 @@ class TestIntegration:
         """Test detailed health check endpoint."""
         response = client.get("/api/health/")
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "status" in data
         assert "app" in data
         assert "services" in data
         assert "configuration" in data
     
     def test_download_endpoint_validation(self, client):
-        """Test download endpoint with invalid data."""
-        # Test with missing URL
-        response = client.post("/api/download/", json={})
-        assert response.status_code == 422
-        
-        # Test with invalid URL
-        response = client.post("/api/download/", json={"url": "invalid-url"})
+        """Test download endpoint rejects a body without a URL."""
+        response = client.post(
+            "/api/download/",
+            content=orjson.dumps({}),
+            headers={"Content-Type": "application/json"}
+        )
         assert response.status_code == 422
     
+    def test_download_endpoint_invalid_url(self, client):
+        """Test download endpoint reports a malformed URL as an error response."""
+        response = client.post(
+            "/api/download/",
+            content=orjson.dumps({"url": "invalid-url"}),
+            headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 200
+        data = orjson.loads(response.content)
+        assert data["success"] is False
+        assert data["error_code"] == "INVALID_URL"
+    
     def test_cors_headers(self, client):
-        """Test CORS headers are present."""
-        response = client.options("/api/download/")
+        """Test CORS preflight headers for allowed and disallowed origins."""
+        from app.config import AppConfig
+        
+        allowed = AppConfig.get_cors_origins()[0]
+        response = client.options(
+            "/api/download/",
+            headers={"Origin": allowed, "Access-Control-Request-Method": "POST"},
+        )
         assert response.status_code == 200
-        assert "access-control-allow-origin" in response.headers
+        assert response.headers["access-control-allow-origin"] == allowed
+        
+        if "*" in AppConfig.get_cors_origins():
+            pytest.skip("CORS_ORIGINS allows every origin")
+        response = client.options(
+            "/api/download/",
+            headers={"Origin": "https://disallowed.example", "Access-Control-Request-Method": "POST"},
+        )
+        assert "access-control-allow-origin" not in response.headers
     
     def test_static_files_mount(self, client):
         """Test static files are properly mounted."""
@@ -72,7 +86,7 @@ class TestIntegration:
         
         response = client.get("/openapi.json")
         assert response.status_code == 200
-                data = response.json()
+        data = orjson.loads(response.content)
         assert "openapi" in data
         assert "info" in data
 
@@ -82,16 +96,6 @@ class TestErrorHandling:
     Test error handling and logging.
     """
     
-    @pytest.fixture
-    def app(self):
-        """Create test application."""
-        return create_app()
-    
-    @pytest.fixture
-    def client(self, app):
-        """Create test client."""
-        return TestClient(app)
-    
     def test_invalid_json(self, client):
         """Test handling of invalid JSON."""
         response = client.post(
@@ -134,6 +138,30 @@ class TestConfiguration:
         origins = AppConfig.get_cors_origins()
         assert isinstance(origins, list)
         assert len(origins) > 0
+    
+    def test_config_results_are_copies(self):
+        """Test mutating a returned config result doesn't change later results."""
+        from app.config import AppConfig
+        
+        origins = AppConfig.get_cors_origins()
+        origins.append("https://evil.example")
+        summary = AppConfig.get_config_summary()
+        summary["app"]["name"] = "changed"
+        
+        assert "https://evil.example" not in AppConfig.get_cors_origins()
+        assert AppConfig.get_config_summary()["app"]["name"] == AppConfig.APP_NAME
+    
+    def test_config_validation_recreates_directories(self, tmp_path, monkeypatch):
+        """Test every validate_config call checks (and recreates) the directories."""
+        from app.config import AppConfig
+        
+        monkeypatch.setattr(AppConfig, "LOG_DIR", str(tmp_path / "logs"))
+        monkeypatch.setattr(AppConfig, "MEDIA_DIR", str(tmp_path / "media"))
+        
+        assert AppConfig.validate_config() == []
+        (tmp_path / "media").rmdir()
+        assert AppConfig.validate_config() == []
+        assert (tmp_path / "media").is_dir()
 
 
 if __name__ == "__main__":
@@ -1,164 +1,115 @@
-#!/usr/bin/env python3
 """
-Test script for API validation with invalid URLs.
-Tests that the API properly rejects invalid URLs.
+API validation tests for invalid and valid URLs.
+Tests that the download endpoint rejects invalid URLs and accepts supported ones.
 """
 
-import requests
-import json
-
-def test_invalid_urls():
-    """Test API with various invalid URLs."""
-    base_url = "http://localhost:8000"
-    endpoint = f"{base_url}/api/download/"
-    
-    print("🧪 Testing API with invalid URLs...")
-    print("=" * 60)
-    
-    # Test cases with invalid URLs
-    invalid_urls = [
-        "https://www.youtube.com/watch?v=123",
-        "https://www.facebook.com/post/123",
-        "https://www.instagram.com/user/",  # Profile, not post
-        "https://www.tiktok.com/@user/",  # Profile, not video
-        "not-a-url",
-        "",
-        "https://",
-        "ftp://example.com",
-        "https://www.google.com",
-        "https://www.instagram.com/",  # Just domain
-        "https://www.tiktok.com/",  # Just domain
-    ]
-    
-    passed = 0
-    total = len(invalid_urls)
-    
-    for url in invalid_urls:
-        try:
-            print(f"Testing URL: {url}")
-            
-            response = requests.post(
-                endpoint,
-                json={"url": url},
-                headers={"Content-Type": "application/json"},
-                timeout=10
-            )
-            
-            if response.status_code in [400, 422]:
-                data = response.json()
-                print(f"   ✅ Correctly rejected ({response.status_code})")
-                if response.status_code == 422:
-                    # Pydantic validation error
-                    detail = data.get('detail', [{}])[0] if isinstance(data.get('detail'), list) else data.get('detail', {})
-                    print(f"   Error: {detail.get('msg', 'Validation error')}")
-                else:
-                    # Custom validation error
-                    print(f"   Error: {data.get('detail', {}).get('message', 'Unknown error')}")
-                passed += 1
-            else:
-                print(f"   ❌ Expected 400/422, got {response.status_code}")
-                print(f"   Response: {response.text}")
-            
-        except requests.exceptions.RequestException as e:
-            print(f"   ❌ Request failed: {str(e)}")
-        except Exception as e:
-            print(f"   ❌ Unexpected error: {str(e)}")
-        
-        print()
-    
-    print("=" * 60)
-    print(f"📊 Results: {passed}/{total} invalid URLs correctly rejected")
-    
-    if passed == total:
-        print("🎉 All invalid URLs were properly rejected!")
-    else:
-        print("❌ Some invalid URLs were not rejected. Check validation logic.")
-    
-    return passed == total
-
-def test_valid_urls():
-    """Test API with valid URLs (should work if server is running)."""
-    base_url = "http://localhost:8000"
-    endpoint = f"{base_url}/api/download/"
-    
-    print("\n🧪 Testing API with valid URLs...")
-    print("=" * 60)
-    
-    # Test cases with valid URLs (these might fail due to authentication, but should not be rejected for format)
-    valid_urls = [
-        "https://www.instagram.com/p/DOOFdyJjLbG/",  # Real Instagram post
-        "https://www.instagram.com/reel/example/",   # Instagram reel format
-        "https://www.tiktok.com/@user/video/1234567890/",  # TikTok format
-        "https://vm.tiktok.com/ABC123/",  # TikTok short format
-    ]
-    
-    passed = 0
-    total = len(valid_urls)
-    
-    for url in valid_urls:
-        try:
-            print(f"Testing URL: {url}")
-            
-            response = requests.post(
-                endpoint,
-                json={"url": url},
-                headers={"Content-Type": "application/json"},
-                timeout=10
-            )
-            
-            if response.status_code == 400:
-                data = response.json()
-                if "Invalid URL" in str(data.get('detail', {})):
-                    print(f"   ❌ Valid URL rejected as invalid format")
-                else:
-                    print(f"   ✅ Correctly processed (400 for other reasons)")
-                    print(f"   Reason: {data.get('detail', {}).get('message', 'Unknown error')}")
-                    passed += 1
-            elif response.status_code in [200, 201, 202]:
-                print(f"   ✅ Successfully processed")
-                passed += 1
-            else:
-                print(f"   ⚠️  Got status {response.status_code} (might be authentication/network issue)")
-                print(f"   Response: {response.text[:200]}...")
-                passed += 1  # Count as passed if not rejected for format
-            
-        except requests.exceptions.RequestException as e:
-            print(f"   ⚠️  Request failed: {str(e)} (might be server not running)")
-            passed += 1  # Count as passed if server not running
-        except Exception as e:
-            print(f"   ❌ Unexpected error: {str(e)}")
-        
-        print()
-    
-    print("=" * 60)
-    print(f"📊 Results: {passed}/{total} valid URLs processed correctly")
-    
-    return passed == total
-
-def main():
-    """Run all URL validation tests."""
-    print("🚀 Starting API URL Validation Tests")
-    print("=" * 60)
-    
-    # Test invalid URLs
-    invalid_ok = test_invalid_urls()
-    
-    # Test valid URLs
-    valid_ok = test_valid_urls()
-    
-    print("=" * 60)
-    if invalid_ok and valid_ok:
-        print("✅ All API URL validation tests passed!")
-        print("🎯 API is ready to reject invalid URLs and process valid ones")
+import os
+from datetime import datetime
+
+import orjson
+import pytest
+
+from app.routers.download import get_instagram_service, get_tiktok_service
+from app.schemas.requests import INSTAGRAM_POST_REGEX, TIKTOK_POST_REGEX
+
+ENDPOINT = "/api/download/"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# The router reports URL problems as a 200 ErrorResponse with one of these codes
+URL_ERROR_CODES = {"INVALID_URL", "INVALID_URL_FORMAT"}
+
+# Test cases with invalid URLs
+INVALID_URLS = [
+    "https://www.youtube.com/watch?v=123",
+    "https://www.facebook.com/post/123",
+    "https://www.instagram.com/user/",  # Profile, not post
+    "https://www.tiktok.com/@user/",  # Profile, not video
+    "not-a-url",
+    "",
+    "https://",
+    "ftp://example.com",
+    "https://www.google.com",
+    "https://www.instagram.com/",  # Just domain
+    "https://www.tiktok.com/",  # Just domain
+]
+
+# Test cases with valid URLs (these might fail due to authentication, but should not be rejected for format)
+VALID_URLS = [
+    "https://www.instagram.com/p/DOOFdyJjLbG/",  # Real Instagram post
+    "https://www.instagram.com/reel/example/",   # Instagram reel format
+    "https://www.tiktok.com/@user/video/1234567890/",  # TikTok format
+    "https://vm.tiktok.com/ABC123/",  # TikTok short format
+]
+
+# Supported URLs followed by extra characters; accepted only if the end-anchored schema patterns accept them
+TRAILING_JUNK_URLS = [
+    "https://www.instagram.com/p/ABC123/?igsh=xyz",
+    "https://www.instagram.com/p/ABC123/extra",
+    "https://www.instagram.com/p/ABC123#fragment",
+    "https://www.instagram.com/reel/ABC123!!",
+    "https://www.tiktok.com/@user/video/1234567890?lang=en",
+    "https://www.tiktok.com/@user/video/1234567890abc",
+    "https://www.tiktok.com/@user/video/1234567890/extra",
+    "https://vm.tiktok.com/ABC123/",
+    "https://vm.tiktok.com/ABC123/extra",
+    "https://m.tiktok.com/v/1234567890",
+]
+
+
+class FakeService:
+    """Download service stand-in returning fixed metadata without touching the network."""
+
+    async def download_post(self, url):
+        return "video.mp4", {
+            "author": "user",
+            "description": "",
+            "created_at": datetime(2025, 1, 2),
+            "video_url": "http://testserver/static/video.mp4",
+            "audio_url": None,
+        }
+
+
+@pytest.fixture
+def offline_client(app, client):
+    """Test client whose download services are replaced by FakeService."""
+    app.dependency_overrides[get_instagram_service] = FakeService
+    app.dependency_overrides[get_tiktok_service] = FakeService
+    yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("url", TRAILING_JUNK_URLS)
+def test_trailing_junk_matches_schema_patterns(offline_client, url):
+    """Test the endpoint accepts exactly the URLs the schema patterns accepted before the validator swap."""
+    expected_supported = bool(INSTAGRAM_POST_REGEX.match(url) or TIKTOK_POST_REGEX.match(url))
+
+    response = offline_client.post(ENDPOINT, content=orjson.dumps({"url": url}), headers=JSON_HEADERS)
+    assert response.status_code == 200
+
+    data = orjson.loads(response.content)
+    if expected_supported:
+        assert data["author"] == "user"
     else:
-        print("❌ Some tests failed. Check the validation logic.")
-    
-    print("\n📝 API should:")
-    print("   ✅ Reject YouTube, Facebook, and other non-social media URLs")
-    print("   ✅ Reject Instagram/TikTok profile URLs (not posts/videos)")
-    print("   ✅ Reject malformed URLs")
-    print("   ✅ Accept valid Instagram post/reel URLs")
-    print("   ✅ Accept valid TikTok video URLs")
-
-if __name__ == "__main__":
-    main()
+        assert data["success"] is False
+        assert data["error_code"] == "INVALID_URL_FORMAT"
+
+
+@pytest.mark.parametrize("url", INVALID_URLS)
+def test_invalid_urls(client, url):
+    """Test that the API rejects an invalid URL."""
+    response = client.post(ENDPOINT, content=orjson.dumps({"url": url}), headers=JSON_HEADERS)
+    assert response.status_code == 200
+
+    data = orjson.loads(response.content)
+    assert data["success"] is False
+    assert data["error_code"] in URL_ERROR_CODES
+
+
+@pytest.mark.skipif(not os.getenv("LIVE"), reason="needs network")
+@pytest.mark.parametrize("url", VALID_URLS)
+def test_valid_urls(client, url):
+    """Test that the API accepts a valid URL format (downloads may still fail for other reasons)."""
+    response = client.post(ENDPOINT, content=orjson.dumps({"url": url}), headers=JSON_HEADERS)
+
+    data = orjson.loads(response.content)
+    assert data.get("error_code") not in URL_ERROR_CODES
@@ -0,0 +1,101 @@
+"""
+Unit tests for TikTokService.download_post with yt-dlp stubbed out.
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from app.services.base_service import BaseService
+from app.services.tiktok_service import TikTokService
+from app.utils.exceptions import ValidationError
+from app.utils.url_validator import _ALLOWED_HOSTS, validate_url
+
+VIDEO_ID = "1234567890"
+URL = f"https://www.tiktok.com/@user/video/{VIDEO_ID}"
+
+# Path accepted by the validator on each TikTok host, by the host's leading label
+PATHS_BY_SUBDOMAIN = {
+    "vm": "/ABC123/",
+    "vt": "/ABC123/",
+    "m": f"/v/{VIDEO_ID}",
+}
+TIKTOK_HOSTS = sorted(host for host in _ALLOWED_HOSTS if host.endswith("tiktok.com"))
+
+
+def tiktok_url(host):
+    """Build a URL the validator accepts for the given TikTok host."""
+    subdomain = host.removeprefix("www.").split(".")[0]
+    return f"https://{host}" + PATHS_BY_SUBDOMAIN.get(subdomain, f"/@user/video/{VIDEO_ID}")
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """TikTok service writing into a temporary media directory, without yt-dlp or ffmpeg."""
+    service = TikTokService(media_dir=str(tmp_path))
+
+    def fake_run_ydl(url, ydl_opts):
+        with open(ydl_opts["outtmpl"], "wb") as f:
+            f.write(b"fake mp4 data")
+        return {
+            "uploader": "user",
+            "description": "A test video",
+            "upload_date": "20250102",
+        }
+
+    async def fake_extract_audio(video_path):
+        return False, None
+
+    monkeypatch.setattr(service, "_run_ydl", fake_run_ydl)
+    monkeypatch.setattr(service, "_extract_audio_async", fake_extract_audio)
+    return service
+
+
+@pytest.mark.parametrize("level", [logging.INFO, logging.DEBUG])
+def test_download_post(service, tmp_path, caplog, level):
+    """Test a fresh download returns metadata and writes sidecar files."""
+    caplog.set_level(level)
+
+    async def run():
+        result = await service.download_post(URL)
+        await BaseService.wait_for_background_tasks(timeout=5.0)
+        return result
+
+    filename, metadata = asyncio.run(run())
+
+    assert filename == f"{VIDEO_ID}.mp4"
+    assert metadata["author"] == "user"
+    assert metadata["description"] == "A test video"
+    assert metadata["created_at"].strftime("%Y%m%d") == "20250102"
+    assert metadata["video_url"].endswith(f"/static/{VIDEO_ID}.mp4")
+    assert metadata["audio_url"] is None
+    assert (tmp_path / f"{VIDEO_ID}.txt").read_text(encoding="utf-8") == "A test video"
+    assert (tmp_path / f"{VIDEO_ID}.json").exists()
+
+
+@pytest.mark.parametrize("host", TIKTOK_HOSTS)
+def test_download_post_accepts_validated_hosts(service, host):
+    """Test every TikTok URL the router's validator accepts also passes the service check."""
+    url = tiktok_url(host)
+    assert validate_url(url)[:2] == (True, "tiktok")
+
+    async def run():
+        result = await service.download_post(url)
+        await BaseService.wait_for_background_tasks(timeout=5.0)
+        return result
+
+    filename, _ = asyncio.run(run())
+
+    assert filename.endswith(".mp4")
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.instagram.com/p/ABC123/",
+    "https://www.tiktok.com/@user/",
+    "https://tiktok.com.example.com/@user/video/1",
+])
+def test_download_post_rejects_other_urls(service, url):
+    """Test URLs the validator rejects raise ValidationError before yt-dlp runs."""
+    with pytest.raises(ValidationError):
+        asyncio.run(service.download_post(url))
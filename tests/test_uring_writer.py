@@ -0,0 +1,129 @@
+"""
+Unit tests for UringWriter against a fake liburing module that performs the
+queued writes with pwrite, so no kernel io_uring support is needed.
+"""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import uring_writer
+from app.utils.uring_writer import UringWriter
+
+
+class FakeLiburing:
+    """Minimal stand-in for the liburing binding, with the same call signatures."""
+
+    def __init__(self, short_writes=0):
+        # Number of upcoming completions that write (and report) only half their buffer
+        self.short_writes = short_writes
+        self.submits = 0
+
+    def io_uring(self):
+        return SimpleNamespace(queued=[], completions=[], exited=False)
+
+    def io_uring_cqe(self):
+        return SimpleNamespace(res=None)
+
+    def io_uring_queue_init(self, entries, ring, flags):
+        ring.entries = entries
+
+    def io_uring_queue_exit(self, ring):
+        ring.exited = True
+
+    def io_uring_get_sqe(self, ring):
+        sqe = SimpleNamespace()
+        ring.queued.append(sqe)
+        return sqe
+
+    def io_uring_prep_write(self, sqe, fd, buf, nbytes, offset):
+        sqe.args = (fd, buf, nbytes, offset)
+
+    def io_uring_submit(self, ring):
+        self.submits += 1
+        for sqe in ring.queued:
+            fd, buf, nbytes, offset = sqe.args
+            if self.short_writes:
+                self.short_writes -= 1
+                nbytes //= 2
+            ring.completions.append(os.pwrite(fd, buf[:nbytes], offset))
+        submitted, ring.queued = len(ring.queued), []
+        return submitted
+
+    def io_uring_wait_cqe(self, ring, cqe):
+        cqe.res = ring.completions.pop(0)
+
+    def io_uring_cqe_seen(self, ring, cqe):
+        cqe.res = None
+
+
+@pytest.fixture
+def fake_liburing(monkeypatch):
+    fake = FakeLiburing()
+    monkeypatch.setattr(uring_writer, "liburing", fake)
+    monkeypatch.setattr(uring_writer, "URING_AVAILABLE", True)
+    return fake
+
+
+def write_chunks(path, chunks, batch_size):
+    """Write chunks through a UringWriter and return it after closing."""
+    async def run():
+        writer = UringWriter(path, batch_size=batch_size)
+        writer.open()
+        try:
+            for chunk in chunks:
+                await writer.write(chunk)
+            await writer.flush()
+        finally:
+            writer.close()
+        return writer
+
+    return asyncio.run(run())
+
+
+def test_batches_are_submitted_and_reaped(fake_liburing, tmp_path):
+    """Test full batches and the flushed remainder all land at their offsets."""
+    path = tmp_path / "video.mp4"
+    chunks = [bytes([i]) * (1000 + i) for i in range(5)]
+
+    writer = write_chunks(path, chunks, batch_size=2)
+
+    assert path.read_bytes() == b"".join(chunks)
+    assert fake_liburing.submits == 3
+    assert writer._ring is None and writer._fd == -1
+
+
+def test_short_write_is_redone(fake_liburing, tmp_path):
+    """Test a completion reporting a short write makes the batch be rewritten."""
+    fake_liburing.short_writes = 1
+    path = tmp_path / "video.mp4"
+    chunks = [b"a" * 4096, b"b" * 4096]
+
+    write_chunks(path, chunks, batch_size=2)
+
+    assert path.read_bytes() == b"".join(chunks)
+
+
+def test_failed_write_raises(fake_liburing, tmp_path, monkeypatch):
+    """Test a negative completion result surfaces as OSError."""
+    def failing_submit(ring):
+        ring.completions.extend([-28] * len(ring.queued))
+        ring.queued = []
+
+    monkeypatch.setattr(fake_liburing, "io_uring_submit", failing_submit)
+
+    with pytest.raises(OSError):
+        write_chunks(tmp_path / "video.mp4", [b"data"], batch_size=1)
+
+
+def test_incompatible_binding_raises_oserror(monkeypatch, tmp_path):
+    """Test a binding without the expected API fails open() with OSError, so callers fall back."""
+    monkeypatch.setattr(uring_writer, "liburing", SimpleNamespace())
+    monkeypatch.setattr(uring_writer, "URING_AVAILABLE", True)
+
+    writer = UringWriter(tmp_path / "video.mp4")
+    with pytest.raises(OSError):
+        writer.open()
+    writer.close()
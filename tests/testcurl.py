@@ -1,8 +1,16 @@
+import orjson
 import requests
 
+ENDPOINT = "http://localhost:8000/api/download/"
+
+# One connection pool and header set for every call
+session = requests.Session()
+session.headers["Content-Type"] = "application/json"
+
 
 def test_download_video(instagram_url):
-    response = requests.post("http://localhost:8000/api/download/", json={"url": instagram_url})
+    # The payload is serialized with orjson and sent as raw bytes
+    response = session.post(ENDPOINT, data=orjson.dumps({"url": instagram_url}))
     return response.json()
 
 link = 'https://www.instagram.com/p/DghfghfgOOFdyJjLbG/?img_index=10&igsutghfhfdhfdgh=MXRzgfhfdhgdHZ2cGVudGF5ZA=='
@@ -10,4 +18,3 @@ link2 = 'https://www.instagram.com/reel/DPFJiwpDiBL/'
 link3 = 'https://chatgpt.com/c/68dda1d8-955c-8328-b797-fa358aca668c'
 data = test_download_video(link)
 print(data)
-